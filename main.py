@@ -1,4 +1,5 @@
 import sys
+import gc
 import logging
 import os
 
@@ -43,6 +44,10 @@ from PySide6.QtGui import QIcon
 from src.main_window import ModelManagerWindow
 
 if __name__ == "__main__":
+    # [Memory] Qt wrappers and scan dicts are allocated in bursts; a larger young
+    # generation keeps the cyclic GC from sweeping mid-scan or mid-selection.
+    gc.set_threshold(50000, 20, 20)
+
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     
@@ -73,4 +78,9 @@ if __name__ == "__main__":
 
     window = ModelManagerWindow(debug_mode=debug_mode)
     window.show()
+
+    # [Memory] Widgets, controllers and modules built so far live for the whole session;
+    # move them to the permanent generation so later collections don't re-trace them.
+    gc.collect()
+    gc.freeze()
     sys.exit(app.exec())
@@ -1,11 +1,14 @@
 import os
+from collections import deque
 from PySide6.QtCore import QObject, Signal, QTimer
 from PySide6.QtWidgets import QMessageBox, QInputDialog
 
 # Import Worker and Dialogs
 from ..workers import MetadataWorker
+from ..services.file_service import FileService
+from ..services.api_service import ApiService
 from ..ui_components import OverwriteConfirmDialog
-from ..core import calculate_structure_path
+from ..core import calculate_structure_path, CACHE_DIR_NAME
 
 class MetadataController(QObject):
     # Signals to update UI
@@ -21,7 +24,30 @@ class MetadataController(QObject):
         self.directories = directories
         self.parent_widget = parent # For dialogs
         self.worker = None
-        self.queue = [] # Queue of (mode, targets, manual_url, overwrite_behavior)
+        self.queue = deque() # Queue of (mode, targets, manual_url, overwrite_behavior)
+        self._dir_listing_cache = {} # cache_dir -> (mtime, set of entry names)
+        self._api_service = None
+        self._api_keys = None
+
+    def warmup(self):
+        """Builds the shared API client ahead of the first match.
+
+        URL patterns are compiled at import time in workers.py; what back-to-back
+        matches actually re-paid was a fresh HTTP session (new TLS handshakes) per batch.
+        """
+        self._get_api_service()
+
+    def _get_api_service(self):
+        keys = (self.app_settings.get("civitai_api_key", ""), self.app_settings.get("hf_api_key", ""))
+        if self._api_service is None or keys != self._api_keys:
+            self._api_service = ApiService(*keys)
+            self._api_keys = keys
+        return self._api_service
+
+    def store_precomputed_hash(self, path, sha256):
+        """Seeds the hash cache so the next auto-match skips hashing `path`."""
+        cache_root = self.app_settings.get("cache_path", "") or CACHE_DIR_NAME
+        FileService(cache_root).store_hash(path, sha256, self.directories)
 
     def run_civitai(self, mode, targets, manual_url_override=None, overwrite_behavior_override=None):
         if not targets: return
@@ -87,11 +113,12 @@ class MetadataController(QObject):
             hf_key=self.app_settings.get("hf_api_key", ""),
             cache_root=cache_path,
             directories=self.directories,
-            overwrite_behavior=overwrite_behavior
+            overwrite_behavior=overwrite_behavior,
+            api_service=self._get_api_service()
         )
 
         # Connect Worker Signals
-        self.worker.status_update.connect(lambda msg: self.status_message.emit(msg, 0))
+        self.worker.status_update.connect(self._on_worker_status)
         self.worker.batch_started.connect(self.batch_started.emit)
         self.worker.task_progress.connect(self.task_progress.emit)
         self.worker.model_processed.connect(self.model_processed.emit)
@@ -102,15 +129,35 @@ class MetadataController(QObject):
         
         self.worker.start()
 
+    def _on_worker_status(self, msg):
+        self.status_message.emit(msg, 0)
+
     def _on_worker_finished(self):
         self.batch_processed.emit()
+        # [Memory] Drop connections so the finished worker can be reclaimed
+        if self.worker:
+            try:
+                self.worker.status_update.disconnect(self._on_worker_status)
+            except (RuntimeError, TypeError):
+                pass
         self.worker = None
-        self._process_next_in_queue()
+        # [Fix] Pump from a fresh event-loop frame instead of nesting inside the finished slot
+        QTimer.singleShot(0, self._process_next_in_queue)
 
     def _process_next_in_queue(self):
+        if self.worker is not None: return
         if self.queue:
-            item = self.queue.pop(0)
-            mode, targets, manual_url, overwrite_beh = item
+            mode, targets, manual_url, overwrite_beh = self.queue.popleft()
+            targets = list(targets)
+            # [Optimization] Merge consecutive jobs with identical options into one worker run
+            # (manual jobs carry their own URL and stay separate)
+            while manual_url is None and self.queue:
+                next_mode, next_targets, next_url, next_overwrite = self.queue[0]
+                if next_mode != mode or next_url is not None or next_overwrite != overwrite_beh:
+                    break
+                self.queue.popleft()
+                targets.extend(next_targets)
+            targets = list(dict.fromkeys(targets))
             self.status_message.emit(f"正在处理队列中的任务... ({len(self.queue)} 剩余)", 3000)
             self._start_worker(mode, targets, manual_url, overwrite_beh)
         else:
@@ -128,23 +175,44 @@ class MetadataController(QObject):
         conflicts = []
         # Need cache root logic that matches BaseManager...
         # We can duplicate the simple logic or ask App设置
-        cache_root = self.app_settings.get("cache_path", "")
-        if not cache_root:
-             from ..core import CACHE_DIR_NAME
-             cache_root = CACHE_DIR_NAME
+        # [Optimization] Loop invariants resolved once per batch
+        cache_root = self.app_settings.get("cache_path", "") or CACHE_DIR_NAME
+        directories = self.directories
 
+        # All cache dirs share one parent (cache_root/<mode>); listing it once lets
+        # models without any cache skip their per-directory stat entirely.
+        existing_dirs = None
         for path in targets:
-            cache_dir = calculate_structure_path(path, cache_root, self.directories)
-            if not os.path.exists(cache_dir): continue
+            cache_dir = calculate_structure_path(path, cache_root, directories)
+            if existing_dirs is None:
+                existing_dirs = self._names_in(os.path.dirname(cache_dir))
+            if os.path.basename(cache_dir) not in existing_dirs: continue
+            names = self._names_in(cache_dir)
+            if not names: continue
             
             name = os.path.splitext(os.path.basename(path))[0]
-            if os.path.exists(os.path.join(cache_dir, name + ".json")):
+            if (name + ".json") in names or (name + ".md") in names:
                 conflicts.append(path)
-            elif os.path.exists(os.path.join(cache_dir, name + ".md")):
-                 conflicts.append(path)
                  
         return conflicts
 
+    def _names_in(self, cache_dir):
+        """Entry names of `cache_dir`, listed once and reused until its mtime changes."""
+        try:
+            mtime = os.stat(cache_dir).st_mtime
+        except OSError:
+            return set()
+        cached = self._dir_listing_cache.get(cache_dir)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            with os.scandir(cache_dir) as it:
+                names = {e.name for e in it}
+        except OSError:
+            return set()
+        self._dir_listing_cache[cache_dir] = (mtime, names)
+        return names
+
     def stop(self):
         if self.worker and self.worker.isRunning():
             self.worker.stop()
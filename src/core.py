@@ -1,9 +1,12 @@
 import sys
 import os
+import importlib.util
 import json
 import gzip
+import tempfile
 import re
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
 from PySide6.QtCore import QMutex
@@ -17,27 +20,28 @@ except ImportError:
     logging.critical("'requests' library is missing. Run: pip install requests")
     sys.exit(1)
 
-HAS_PILLOW = False
-try:
-    from PIL import Image
-    from PIL.PngImagePlugin import PngInfo
-    HAS_PILLOW = True
-except ImportError:
+# [Memory] Pillow, markdown and markdownify are only probed here, not imported;
+# the code paths that need them import lazily so startup doesn't pay for them.
+HAS_PILLOW = importlib.util.find_spec("PIL") is not None
+if not HAS_PILLOW:
     logging.warning("Pillow library is missing. pip install pillow")
 
-HAS_MARKDOWN = False
-try:
-    import markdown
-    HAS_MARKDOWN = True
-except ImportError:
-    pass
+HAS_MARKDOWN = importlib.util.find_spec("markdown") is not None
 
-HAS_MARKDOWNIFY = False
+HAS_MARKDOWNIFY = importlib.util.find_spec("markdownify") is not None
+
+# [Optimization] Optional faster JSON codecs for metadata sidecars (orjson, then ujson)
+HAS_ORJSON = False
+HAS_UJSON = False
 try:
-    import markdownify
-    HAS_MARKDOWNIFY = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    pass
+    try:
+        import ujson
+        HAS_UJSON = True
+    except ImportError:
+        pass
 
 # ==========================================
 # Constants & 路径s
@@ -62,9 +66,14 @@ PREVIEW_EXTENSIONS = [".mp4", ".webm", ".preview.png", ".png", ".jpg", ".jpeg",
 IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".preview.png"}
 MAX_FILE_LOAD_MB = 200
 MAX_FILE_LOAD_BYTES = MAX_FILE_LOAD_MB * 1024 * 1024
+# Prompt libraries are parsed whole and rewritten on edit, so keep them well below the media cap
+MAX_PROMPT_FILE_BYTES = 16 * 1024 * 1024
 
 VIDEO_EXTENSIONS = {".mp4", ".webm", ".mov"} 
 
+# Final suffixes of PREVIEW_EXTENSIONS (".preview.png" -> ".png") for a one-lookup pre-filter
+_PREVIEW_SUFFIXES = frozenset("." + e.rsplit(".", 1)[1] for e in PREVIEW_EXTENSIONS)
+
 # ==========================================
 # Helper Classes
 # ==========================================
@@ -79,9 +88,57 @@ class QMutexWithLocker:
 # ==========================================
 # Utility Functions
 # ==========================================
+def json_loads_bytes(raw: bytes) -> Any:
+    """Parses UTF-8 JSON bytes with the fastest available codec."""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    if HAS_UJSON:
+        return ujson.loads(raw)
+    return json.loads(raw)
+
+def json_dumps_bytes(data: Any, pretty: bool = False) -> bytes:
+    """Serializes to UTF-8 JSON bytes with the fastest available codec.
+
+    Output is compact unless ``pretty`` is set, which indents by two spaces for
+    files users are expected to read or edit by hand.
+    """
+    if HAS_ORJSON:
+        # Non-str keys are stringified, as the stdlib does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    if HAS_UJSON:
+        return ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False, indent=2 if pretty else 0).encode('utf-8')
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+# Read once at import (before any worker thread starts): os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def write_bytes_atomic(path: str, payload: bytes) -> None:
+    """Writes `payload` to a unique temp file next to `path` and swaps it in,
+    so a crash never leaves a truncated file and concurrent writers never share a temp file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        # mkstemp creates 0600; keep the existing file's mode, or the usual one for a new file
+        try: mode = os.stat(path).st_mode & 0o7777
+        except OSError: mode = 0o666 & ~_UMASK
+        try: os.chmod(tmp_path, mode)
+        except OSError: pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+_INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:\"/\\|?*]')
+
 def sanitize_filename(filename: str) -> str:
     """Removes invalid characters from a filename."""
-    return re.sub(r'[<>:\"/\\|?*]', '', filename).strip()
+    return _INVALID_FILENAME_CHARS_RE.sub('', filename).strip()
 
 def calculate_structure_path(model_path: str, cache_root: str, directories: Dict[str, Any], mode: str = "model") -> str:
     """
@@ -99,6 +156,50 @@ def calculate_structure_path(model_path: str, cache_root: str, directories: Dict
     
     return os.path.join(cache_root, safe_mode, model_name)
 
+def filter_directories_by_mode(directories: Dict[str, Any], mode: str) -> Dict[str, Any]:
+    """Returns the configured folders belonging to one tab. Entries without a mode are model folders."""
+    return {k: v for k, v in directories.items() if v.get("mode", "model") == mode}
+
+@lru_cache(maxsize=256)
+def _dir_preview_index(folder: str, mtime_ns: int) -> Dict[str, str]:
+    """
+    Maps lowercase file stem -> highest-priority preview path for one directory.
+    Keyed by the directory's mtime so adding/removing previews invalidates it.
+    """
+    index = {}
+    rank = {}
+    try:
+        with os.scandir(folder or ".") as it:
+            for entry in it:
+                name = entry.name.lower()
+                # Most entries (models, json, txt) are rejected by a single set lookup
+                if os.path.splitext(name)[1] not in _PREVIEW_SUFFIXES:
+                    continue
+                # PREVIEW_EXTENSIONS is ordered by priority
+                for prio, ext in enumerate(PREVIEW_EXTENSIONS):
+                    if name.endswith(ext):
+                        stem = name[:-len(ext)]
+                        if prio < rank.get(stem, len(PREVIEW_EXTENSIONS)):
+                            rank[stem] = prio
+                            index[stem] = entry.path
+    except OSError:
+        pass
+    return index
+
+def find_preview_path(path: str) -> Optional[str]:
+    """Returns the highest-priority preview file next to `path`, or None. Thread-safe."""
+    folder, filename = os.path.split(path)
+    try:
+        mtime_ns = os.stat(folder or ".").st_mtime_ns
+    except OSError:
+        return None
+    stem = os.path.splitext(filename)[0].lower()
+    return _dir_preview_index(folder, mtime_ns).get(stem)
+
+def clear_preview_index():
+    """Forgets cached directory listings (directory mtimes can be coarse on FAT/SMB)."""
+    _dir_preview_index.cache_clear()
+
 # ==========================================
 # Config Management
 # ==========================================
@@ -63,6 +63,7 @@ class ModelManagerWindow(QMainWindow):
         info.append(f"活动线程: {threading.active_count()}")
         objs = gc.get_objects()
         info.append(f"GC对象: {len(objs)}")
+        info.append(f"GC冻结对象: {gc.get_freeze_count()}")
 
         # [Debug] Granular Object Counting
         from PySide6.QtGui import QPixmap, QImage
@@ -92,6 +93,7 @@ class ModelManagerWindow(QMainWindow):
             info.append(f"  - DL Queue: {m_stats['download_queue_size']}")
             info.append(f"  - Meta Queue: {m_stats['metadata_queue_size']}")
             info.append(f"  - Video Active: {m_stats['video_player_active']} ({m_stats['video_player_state']})")
+            info.append(f"  - GC: {m_stats['gc_collections']} runs | Last Pause: {m_stats['gc_last_pause_ms']} ms | Max: {m_stats['gc_max_pause_ms']} ms")
             
             ex_stats = m_stats.get('example_tab_stats', {})
             info.append(f"  - [Examples] Files: {ex_stats.get('file_list_count')} | Active Mem: {ex_stats.get('est_memory_mb', 0):.2f} MB | GC Cnt: {ex_stats.get('gc_counter')}")
@@ -210,6 +212,7 @@ class ModelManagerWindow(QMainWindow):
             if hasattr(self, 'gallery_manager'): self.gallery_manager.set_directories(self.directories)
             
     def closeEvent(self, event):
+        gc.unfreeze() # Let teardown reclaim the objects frozen at startup
         # Propagate close to managers to stop threads
         managers = []
         if hasattr(self, 'model_manager'): managers.append(self.model_manager)
@@ -8,12 +8,19 @@ from PySide6.QtWidgets import (
     QLabel, QPushButton, QComboBox, QLineEdit, QMessageBox, QAbstractItemView,
     QFileDialog, QApplication, QFormLayout
 )
-from PySide6.QtCore import Qt, QThread, QSize
+from PySide6.QtCore import Qt, QThread, QSize, QTimer
 
-from ..workers import FileScannerWorker, ThumbnailWorker, FileSearchWorker, ImageLoader
+from ..workers import FileScannerWorker, ThumbnailWorker, FileSearchWorker, ImageLoader, format_size as scan_format_size
 from ..ui_components import ZoomWindow, MarkdownNoteWidget
 from .example import ExampleTabWidget
-from ..core import VIDEO_EXTENSIONS, PREVIEW_EXTENSIONS, calculate_structure_path
+from ..core import (
+    VIDEO_EXTENSIONS, PREVIEW_EXTENSIONS, CACHE_DIR_NAME, calculate_structure_path,
+    find_preview_path, clear_preview_index
+)
+
+# [Optimization] (divisor, unit) indexed by (bit_length - 1) // 10
+_SIZE_UNITS = ((1, "B"), (1024, "KB"), (1048576, "MB"), (1073741824, "GB"))
+_STAT_CACHE_TTL = 1.0 # [Optimization] Seconds a selection-time stat result is reused
 
 class WrappingLabel(QLabel):
     """QLabel that wraps text without pushing parent layout wider."""
@@ -28,37 +35,42 @@ class WrappingLabel(QLabel):
         super().setText(text)
 
 class SortableTreeItem(QTreeWidgetItem):
+    def sort_key(self):
+        # [Optimization] Computed once per item; sorting 10k+ rows calls __lt__ O(N log N) times
+        try:
+            return self._sort_key
+        except AttributeError:
+            # Folders first, then case-insensitive name
+            self._sort_key = (self.data(0, Qt.UserRole + 1) != "folder", self.text(0).lower())
+            return self._sort_key
+
     def __lt__(self, other):
-        # 1. Always prioritize Folders over Files
-        # 'folder' < 'file' ?
-        # We want folders to appear FIRST. 
-        # In Ascending order, we want Small < Large. So Folder < File.
-        # In Descending order, QTreeWidget reverses the result. So File < Folder?
-        # This means in Descending, Files would come first.
-        # To strictly keep folders on top is tricky without custom proxy model.
-        # For now, let's just make sure "Folder" < "File" so in standard Ascending sort (default), it works.
-        
-        my_type = self.data(0, Qt.UserRole + 1)
-        other_type = other.data(0, Qt.UserRole + 1)
-        
-        if my_type != other_type:
-            # If I am folder (0) and other is file (1)
-            # We want me < other
-            return my_type == "folder"
-            
-        # Same type: sort by text (case insensitive)
-        t1 = self.text(0).lower()
-        t2 = other.text(0).lower()
-        return t1 < t2
+        # Note: QTreeWidget reverses the result in Descending order, so folders
+        # only stay on top for the default Ascending sort.
+        if isinstance(other, SortableTreeItem):
+            return self.sort_key() < other.sort_key()
+        return self.text(0).lower() < other.text(0).lower()
 
 class BaseManagerWidget(QWidget):
     def __init__(self, directories: Dict[str, Any], extensions, app_settings: Dict[str, Any] = None):
         super().__init__()
         self.directories = directories
+        self._directories_snapshot = self._snapshot_directories(directories)
         self.extensions = extensions
         self.app_settings = app_settings or {}
         self.current_path = None
         self.active_scanners = []
+        self._date_cache = {} # [Optimization] mtime -> formatted detail date
+        self._details_cache = {} # [Optimization] path -> (mtime, size_str, date_str)
+        self._stat_cache = {} # [Optimization] path -> (monotonic ts, stat_result), see _stat_cached
+        self._details_dirty = True # [Optimization] Shown details are stale; reselecting must reload
+        # [Optimization] Coalesce rapid selection changes (arrow-key repeat); only the
+        # row the user settles on is loaded by _do_tree_select.
+        self._select_timer = QTimer(self)
+        self._select_timer.setSingleShot(True)
+        self._select_timer.setInterval(75)
+        self._select_timer.timeout.connect(self._on_select_settled)
+        self._select_pending = False
         self.image_loader_thread = ImageLoader()
         self.image_loader_thread.start()
         self._init_base_ui()
@@ -78,10 +90,10 @@ class BaseManagerWidget(QWidget):
 
     @staticmethod
     def format_size(size_bytes):
-        if size_bytes >= 1073741824: return f"{size_bytes / 1073741824:.2f} GB"
-        elif size_bytes >= 1048576: return f"{size_bytes / 1048576:.2f} MB"
-        elif size_bytes >= 1024: return f"{size_bytes / 1024:.2f} KB"
-        return f"{size_bytes} B"
+        idx = min(max(int(size_bytes).bit_length() - 1, 0) // 10, 3)
+        if idx == 0: return f"{size_bytes} B"
+        divisor, unit = _SIZE_UNITS[idx]
+        return f"{size_bytes / divisor:.2f} {unit}"
 
     @staticmethod
     def format_date(mtime, seconds=False):
@@ -89,6 +101,15 @@ class BaseManagerWidget(QWidget):
         fmt = '%Y-%m-%d %H:%M:%S' if seconds else '%Y-%m-%d %H:%M'
         return time.strftime(fmt, time.localtime(mtime))
 
+    def _format_detail_date(self, mtime):
+        """Memoized `format_date(mtime, seconds=True)` for repeated selections."""
+        date_str = self._date_cache.get(mtime)
+        if date_str is None:
+            if len(self._date_cache) >= 256:
+                self._date_cache.pop(next(iter(self._date_cache)))
+            date_str = self._date_cache[mtime] = self.format_date(mtime, seconds=True)
+        return date_str
+
     def save_note_for_path(self, path, text, silent=False):
         if not path: return
         try:
@@ -98,12 +119,12 @@ class BaseManagerWidget(QWidget):
             cache_dir = calculate_structure_path(path, self.get_cache_dir(), self.directories, mode=self.get_mode())
             md_path = os.path.join(cache_dir, model_name + ".md")
             
-            # [FIX] Create directory if it doesn't exist
-            if not os.path.exists(cache_dir):
-                os.makedirs(cache_dir, exist_ok=True)
+            # [FIX] Create directory if it doesn't exist (one syscall when it already does)
+            os.makedirs(cache_dir, exist_ok=True)
             
             with open(md_path, 'w', encoding='utf-8') as f:
                 f.write(text)
+            self._details_dirty = True
                 
             if not silent:
                 self.show_status_message("Note saved (.md).")
@@ -191,7 +212,28 @@ class BaseManagerWidget(QWidget):
     def init_center_panel(self): pass
     def init_right_panel(self): pass
     def init_left_bottom(self, layout): pass
-    def on_tree_select(self): pass
+    def on_tree_select(self):
+        # Leading edge: a lone click loads at once. Changes arriving within the
+        # window (arrow-key repeat) only restart it and the last one wins.
+        if self._select_timer.isActive():
+            self._select_pending = True
+        else:
+            self._select_pending = False
+            self._do_tree_select()
+        self._select_timer.start()
+
+    def _on_select_settled(self):
+        if self._select_pending:
+            self._select_pending = False
+            self._do_tree_select()
+
+    def _do_tree_select(self): pass
+
+    def flush_pending_selection(self):
+        """Applies a selection that is still inside the debounce window."""
+        if self._select_timer.isActive():
+            self._select_timer.stop()
+            self._on_select_settled()
     
     def _setup_info_panel(self, extra_fields: list = None):
         """Helper to create standard info panel (名称, Size, 路径, Date + Extras)."""
@@ -208,6 +250,8 @@ class BaseManagerWidget(QWidget):
             l.setWordWrap(True)
             self.info_labels[k] = l
             form_layout.addRow(f"{k}:", l)
+        # [Optimization] Field order fixed at setup; clearing walks a tuple, no key lookups
+        self._info_labels_tuple = tuple(self.info_labels[k] for k in target_fields)
             
         # Duplicate Warning
         self.lbl_duplicate_warning = QLabel("")
@@ -218,14 +262,36 @@ class BaseManagerWidget(QWidget):
         
         self.center_layout.addLayout(form_layout)
 
+    def _clear_info_labels(self, name_text="-"):
+        """Resets the info panel ('名称' gets `name_text`, the rest '-') in one repaint."""
+        labels = self._info_labels_tuple
+        panel = labels[0].parentWidget()
+        panel.setUpdatesEnabled(False)
+        try:
+            labels[0].setText(name_text)
+            for lbl in labels[1:]:
+                lbl.setText("-")
+        finally:
+            panel.setUpdatesEnabled(True)
+
     # Hook for getting current mode, defaulted to 'model' if not overridden
     def get_mode(self): return "model"
 
     def set_directories(self, directories):
         """Updates the directories and refreshes the combo box."""
         self.directories = directories
+        # [Optimization] Settings saves usually leave this tab's folders untouched;
+        # skip rebuilding the combo and rescanning the tree in that case.
+        snapshot = self._snapshot_directories(directories)
+        if snapshot == self._directories_snapshot: return
+        self._directories_snapshot = snapshot
         self.update_combo_list()
 
+    @staticmethod
+    def _snapshot_directories(directories):
+        # Values are copied because the settings dialog edits the shared dict in place
+        return {k: dict(v) if isinstance(v, dict) else v for k, v in directories.items()}
+
     def update_combo_list(self):
         self.folder_combo.blockSignals(True)
         self.folder_combo.clear()
@@ -265,9 +331,11 @@ class BaseManagerWidget(QWidget):
 
         self.tree.clear()
         self.filter_edit.clear()
+        self._details_dirty = True
+        self._stat_cache.clear()
         
         # [Duplicate Check] Initialize File Map
-        # Key: filename (lowercase), Value: list of full paths
+        # Key: filename (lowercase), Value: {normalized path: display path}
         self.file_map = {} 
         
         # [Thread Safety] Track active thumbnail workers
@@ -282,7 +350,7 @@ class BaseManagerWidget(QWidget):
         self.scanner.start()
         
         # 2. Indexing Scanner (Background, Recursive for full duplicate check)
-        self.indexing_scanner = FileScannerWorker(path, self.extensions, recursive=True)
+        self.indexing_scanner = FileScannerWorker(path, self.extensions, recursive=True, with_stats=False)
         self.indexing_scanner.setObjectName("IndexingScannerThread")
         self.indexing_scanner.batch_ready.connect(self._on_indexing_batch_ready)
         self.indexing_scanner.finished.connect(self.indexing_scanner.deleteLater)
@@ -333,6 +401,10 @@ class BaseManagerWidget(QWidget):
 
     def _populate_item(self, parent_item, current_path, data):
         # ... (Unchanged logic, just ensure no sorting calls here)
+        # [Optimization] Items are built detached and attached with a single addChildren()
+        # so the view handles one row insertion per batch instead of one per item.
+        new_items = []
+        
         # 1. Add Folders
         dirs = data.get("dirs", [])
         # Sort folders by name
@@ -340,8 +412,7 @@ class BaseManagerWidget(QWidget):
         
         for d_name in dirs:
             d_path = os.path.join(current_path, d_name)
-            d_item = SortableTreeItem(parent_item) # [Fix] Use SortableItem
-            d_item.setText(0, f"📁 {d_name}")
+            d_item = SortableTreeItem([f"📁 {d_name}"]) # [Fix] Use SortableItem
             d_item.setData(0, Qt.UserRole, d_path)
             d_item.setData(0, Qt.UserRole + 1, "folder")
             
@@ -349,6 +420,7 @@ class BaseManagerWidget(QWidget):
             dummy = QTreeWidgetItem(d_item) # Dummy doesn't need to be sortable, or maybe yes?
             dummy.setText(0, "Loading...")
             dummy.setData(0, Qt.UserRole, "DUMMY")
+            new_items.append(d_item)
 
         # 2. Add Files
         files = data.get("files", [])
@@ -356,33 +428,28 @@ class BaseManagerWidget(QWidget):
         files.sort(key=lambda x: x['name'].lower())
         
         for f in files:
-            f_item = SortableTreeItem(parent_item) # [Fix] Use SortableItem
-            f_item.setText(0, f['name'])
-            f_item.setText(1, f['size'])
-            f_item.setText(2, f['date'])
+            # [Optimization] Pass all column texts to the constructor in one call
             ext = os.path.splitext(f['name'])[1].lower()
-            f_item.setText(3, ext)
+            f_item = SortableTreeItem([f['name'], f['size'], f['date'], ext]) # [Fix] Use SortableItem
             f_item.setData(0, Qt.UserRole, f['path'])
             f_item.setData(0, Qt.UserRole + 1, "file")
+            new_items.append(f_item)
             
             # [Duplicate Check] Update Global File Map (Initial visible items)
-            f_name_lower = f['name'].lower()
-            if f_name_lower not in self.file_map:
-                self.file_map[f_name_lower] = []
-            if f['path'] not in self.file_map[f_name_lower]:
-                self.file_map[f_name_lower].append(f['path'])
+            self._add_to_file_map(f['name'], f['path'])
+
+        if new_items:
+            parent_item.addChildren(new_items)
+
+    def _add_to_file_map(self, name, path):
+        # [Optimization] Normalize once here so selection-time checks are plain key compares
+        norm_key = os.path.normcase(os.path.abspath(path))
+        self.file_map.setdefault(name.lower(), {}).setdefault(norm_key, path)
 
     def _on_indexing_batch_ready(self, root, dirs, files):
         """Background worker updates the file map for full duplicate detection."""
         for f in files:
-            f_name_lower = f['name'].lower()
-            f_path = f['path']
-            
-            if f_name_lower not in self.file_map:
-                self.file_map[f_name_lower] = []
-            
-            if f_path not in self.file_map[f_name_lower]:
-                self.file_map[f_name_lower].append(f_path)
+            self._add_to_file_map(f['name'], f['path'])
         
         # If currently selected item has duplicates, update warning immediately
         if self.current_path:
@@ -404,23 +471,87 @@ class BaseManagerWidget(QWidget):
         # Subclasses can override or we implement generic if label is standard
         # ModelManagerWidget has lbl_duplicate_warning
         if hasattr(self, 'lbl_duplicate_warning') and self.current_path:
-             f_name = os.path.basename(self.current_path).lower()
-             duplicates = self.file_map.get(f_name, [])
-             if len(duplicates) > 1:
-                 # Exclude current path (More robust comparison)
-                 curr_norm = os.path.normcase(os.path.abspath(self.current_path))
-                 other_paths = [p for p in duplicates if os.path.normcase(os.path.abspath(p)) != curr_norm]
-                 
-                 msg = f"⚠️ Duplicate Found ({len(duplicates)})"
-                 if other_paths:
-                     msg += "\n" + "\n".join(other_paths)
-                 
-                 tooltip = "Same filename detected in:\n" + "\n".join(duplicates)
-                 self.lbl_duplicate_warning.setText(msg)
-                 self.lbl_duplicate_warning.setToolTip(tooltip)
-                 self.lbl_duplicate_warning.show()
-             else:
-                 self.lbl_duplicate_warning.hide()
+             self._update_duplicate_warning(self.current_path)
+
+    def _update_duplicate_warning(self, path):
+        entries = self.file_map.get(os.path.basename(path).lower())
+        # [Optimization] Indexing batches re-trigger this for the same selection;
+        # skip the rebuild while the bucket for this path is unchanged.
+        state = (path, len(entries) if entries else 0)
+        if state == getattr(self, '_dup_warning_state', None):
+            return
+        self._dup_warning_state = state
+        if entries and len(entries) > 1:
+             logging.debug("[Duplicate] Found %d duplicates for %s", len(entries), path)
+             # Exclude current path from display
+             curr_norm = os.path.normcase(os.path.abspath(path))
+             other_paths = [p for k, p in entries.items() if k != curr_norm]
+             
+             msg = f"⚠️ Duplicate Files Found ({len(entries)})"
+             if other_paths:
+                 msg += "\n" + "\n".join(other_paths)
+             
+             tooltip = "Same filename detected in:\n" + "\n".join(entries.values())
+             self.lbl_duplicate_warning.setText(msg)
+             self.lbl_duplicate_warning.setToolTip(tooltip)
+             self.lbl_duplicate_warning.show()
+        else:
+             self.lbl_duplicate_warning.hide()
+
+    def insert_file_item(self, path):
+        """
+        Adds one new file to the tree without rescanning.
+        Returns False when that isn't possible (scan in flight, folder not in the tree,
+        file already listed) and the caller should fall back to refresh_list().
+        """
+        if not hasattr(self, 'scanner') or self.active_scanners: return False
+        try:
+            if self.scanner.isRunning(): return False
+        except RuntimeError: pass # Finished and already deleted
+
+        data = self.directories.get(self.folder_combo.currentText())
+        if not data: return False
+        root = os.path.normpath(data.get("path") if isinstance(data, dict) else data)
+        parent_dir = os.path.normpath(os.path.dirname(path))
+
+        if parent_dir == root:
+            parent_item = self.tree.invisibleRootItem()
+        else:
+            parent_item = self._find_folder_item(parent_dir)
+            if parent_item is None: return False
+            if parent_item.childCount() == 1 and parent_item.child(0).data(0, Qt.UserRole) == "DUMMY":
+                return True # Not expanded yet; expanding scans it from disk
+
+        for i in range(parent_item.childCount()):
+            if parent_item.child(i).data(0, Qt.UserRole) == path:
+                return False # Overwritten in place: the row's size and date are stale
+
+        try:
+            st = os.stat(path)
+        except OSError: return False
+        entry = {
+            "name": os.path.basename(path),
+            "path": path,
+            "size": scan_format_size(st.st_size),
+            "date": time.strftime('%Y-%m-%d', time.localtime(st.st_mtime))
+        }
+        self._populate_item(parent_item, parent_dir, {"dirs": [], "files": [entry]})
+        return True
+
+    def _find_folder_item(self, folder):
+        """Finds the loaded folder item for `folder`, descending only along its ancestors."""
+        parent = self.tree.invisibleRootItem()
+        while True:
+            for i in range(parent.childCount()):
+                child = parent.child(i)
+                if child.data(0, Qt.UserRole + 1) != "folder": continue
+                child_path = os.path.normpath(child.data(0, Qt.UserRole))
+                if child_path == folder: return child
+                if folder.startswith(child_path + os.sep):
+                    parent = child
+                    break
+            else:
+                return None
 
     def on_tree_expand(self, item):
         # Check if it has a dummy child
@@ -580,7 +711,6 @@ class BaseManagerWidget(QWidget):
         if custom_path and os.path.isdir(custom_path):
             return custom_path
             
-        from ..core import CACHE_DIR_NAME
         if not os.path.exists(CACHE_DIR_NAME):
             try: os.makedirs(CACHE_DIR_NAME)
             except OSError: pass
@@ -607,7 +737,6 @@ class BaseManagerWidget(QWidget):
 
         # [Fix] Remove existing preview files to ensure the new one takes precedence
         # (e.g., .mp4 takes priority over .jpg, so we must remove .mp4 if replacing with .jpg)
-        from ..core import PREVIEW_EXTENSIONS
         try:
             for p_ext in PREVIEW_EXTENSIONS:
                 p_path = base + p_ext
@@ -620,6 +749,7 @@ class BaseManagerWidget(QWidget):
         is_video = (ext in VIDEO_EXTENSIONS)
         
         # [Fix] Invalidate cache for the target path to ensure UI updates
+        self.invalidate_details_cache(self.current_path)
         if hasattr(self, 'image_loader_thread'):
             self.image_loader_thread.remove_from_cache(target_path)
             
@@ -721,7 +851,6 @@ class BaseManagerWidget(QWidget):
     
     def copy_media_to_cache(self, file_path, target_relative_path):
         import shutil
-        from ..core import calculate_structure_path
         
         if not target_relative_path: return None
         
@@ -794,6 +923,12 @@ class BaseManagerWidget(QWidget):
                  heavy_workers.append(self.image_loader_thread)
         except RuntimeError: pass
 
+        # Deferred JSON writes are flushed by stop(), so the writer gets the heavy-worker grace period
+        try:
+            if hasattr(self, '_json_writer') and self._json_writer.isRunning():
+                heavy_workers.append(self._json_writer)
+        except RuntimeError: pass
+
         # Collect thumbnail workers
         thumb_workers = []
         if hasattr(self, 'active_thumb_workers'):
@@ -817,7 +952,7 @@ class BaseManagerWidget(QWidget):
         if heavy_workers is None: heavy_workers = []
 
         all_stop_workers = workers + heavy_workers
-        logging.debug(f"[StopAllWorkers] Stopping {len(all_stop_workers)} workers...")
+        logging.debug("[StopAllWorkers] Stopping %d workers...", len(all_stop_workers))
 
         # Phase 1: Send Stop Signal (for those that support it)
         for w in all_stop_workers:
@@ -840,16 +975,17 @@ class BaseManagerWidget(QWidget):
         for w in workers:
             try:
                 if w.isRunning():
-                    logging.debug(f"[StopAllWorkers] Waiting for {w.object名称() if w.object名称() else 'Worker'}...")
+                    name = w.objectName() or 'Worker'
+                    logging.debug("[StopAllWorkers] Waiting for %s...", name)
                     w.wait(1000) # 1 sec each
-                    logging.debug(f"[StopAllWorkers] {w.object名称() if w.object名称() else 'Worker'} finished.")
+                    logging.debug("[StopAllWorkers] %s finished.", name)
             except RuntimeError: pass
 
         # 2. Wait for Thumbnail workers
         for w in thumb_workers:
             try:
                 if w.isRunning():
-                    logging.debug(f"[StopAllWorkers] Waiting for ThumbnailWorker...")
+                    logging.debug("[StopAllWorkers] Waiting for ThumbnailWorker...")
                     w.wait(500)
             except RuntimeError: pass
             
@@ -857,8 +993,8 @@ class BaseManagerWidget(QWidget):
         for w in heavy_workers:
             try:
                 if w.isRunning():
-                    name = w.object名称() if w.object名称() else str(w)
-                    logging.debug(f"[StopAllWorkers] Waiting for {name} (3s timeout)...")
+                    name = w.objectName() or str(w)
+                    logging.debug("[StopAllWorkers] Waiting for %s (3s timeout)...", name)
                     # Give it ample time (e.g. 3s)
                     if not w.wait(3000):
                         logging.warning(f"[StopAllWorkers] {name} stuck. Forcing termination.")
@@ -867,7 +1003,7 @@ class BaseManagerWidget(QWidget):
                         w.wait()
                         logging.warning(f"[StopAllWorkers] {name} terminated.")
                     else:
-                        logging.debug(f"[StopAllWorkers] {name} exited gracefully.")
+                        logging.debug("[StopAllWorkers] %s exited gracefully.", name)
             except RuntimeError: pass
             
         logging.debug("[StopAllWorkers] Cleanup complete.")
@@ -877,7 +1013,7 @@ class BaseManagerWidget(QWidget):
         """Called when this manager tab is hidden (user switched to another tab)."""
         import logging
         logger = logging.getLogger("managers.base")
-        logger.debug(f"[BaseManager] Tab hidden: {self.__class__.__name__}")
+        logger.debug("[BaseManager] Tab hidden: %s", self.__class__.__name__)
         
         # Release preview player resources
         if hasattr(self, 'preview_lbl') and hasattr(self.preview_lbl, 'release_resources'):
@@ -900,52 +1036,74 @@ class BaseManagerWidget(QWidget):
 
 
 
-    def _load_common_file_details(self, path):
+    def _load_common_file_details(self, path, probe=None):
         """
         Refactored common logic for loading file details.
-        Returns: (filename, size_str, date_str, preview_path)
+        probe: optional (size, mtime, preview_path) already gathered off the GUI thread.
+        Returns: (filename, ext, size_str, date_str, preview_path)
         """
         filename = os.path.basename(path)
+        ext = os.path.splitext(filename)[1]
         
         # [Log] Debug
-        logging.debug(f"[_load_common_file_details] Loading details for: {path}")
+        logging.debug("[_load_common_file_details] Loading details for: %s", path)
 
-        try:
-            st = os.stat(path)
-            size_str = self.format_size(st.st_size)
-            date_str = self.format_date(st.st_mtime, seconds=True)
-        except (OSError, ValueError) as e:
-            logging.error(f"失败 to stat file {path}: {e}")
-            size_str = "错误"
-            date_str = "错误"
+        if probe is not None:
+            size, mtime, preview_path = probe
+            size_str = self.format_size(size)
+            date_str = self._format_detail_date(mtime)
+        else:
+            # [Optimization] One stat per selection; reuse formatted fields while the
+            # file's mtime is unchanged.
+            try:
+                st = self._stat_cached(path)
+                cached = self._details_cache.get(path)
+                if cached and cached[0] == st.st_mtime:
+                    size_str, date_str = cached[1], cached[2]
+                else:
+                    size_str = self.format_size(st.st_size)
+                    date_str = self._format_detail_date(st.st_mtime)
+                    if len(self._details_cache) >= 1024:
+                        self._details_cache.pop(next(iter(self._details_cache)))
+                    self._details_cache[path] = (st.st_mtime, size_str, date_str)
+            except (OSError, ValueError) as e:
+                logging.error(f"失败 to stat file {path}: {e}")
+                size_str = "错误"
+                date_str = "错误"
+            
+            # Find Thumbnail Common Logic
+            preview_path = self._find_preview_path(path)
             
         # Duplicate Check
         if self.get_mode() != "gallery" and hasattr(self, 'file_map') and self.lbl_duplicate_warning:
-            f_name_lower = filename.lower()
-            duplicates = self.file_map.get(f_name_lower, [])
-            if len(duplicates) > 1:
-                 logging.debug(f"[Duplicate] Found {len(duplicates)} duplicates for {filename}")
-                 # Exclude current path from display
-                 curr_norm = os.path.normcase(os.path.abspath(path))
-                 other_paths = [p for p in duplicates if os.path.normcase(os.path.abspath(p)) != curr_norm]
-                 
-                 msg = f"⚠️ Duplicate Files Found ({len(duplicates)})"
-                 if other_paths:
-                     msg += "\n" + "\n".join(other_paths)
-
-                 tooltip = "Same filename detected in:\n" + "\n".join(duplicates)
-                 self.lbl_duplicate_warning.setText(msg)
-                 self.lbl_duplicate_warning.setToolTip(tooltip)
-                 self.lbl_duplicate_warning.show()
-            else:
-                 self.lbl_duplicate_warning.hide()
-
-        # Find Thumbnail Common Logic
-        base = os.path.splitext(path)[0]
-        preview_path = None
-        for ext in PREVIEW_EXTENSIONS:
-            if os.path.exists(base + ext):
-                preview_path = base + ext
-                break
-        
-        return filename, size_str, date_str, preview_path
+            self._update_duplicate_warning(path)
+
+        return filename, ext, size_str, date_str, preview_path
+
+    def _find_preview_path(self, path):
+        """Returns the highest-priority preview next to `path` (one stat when cached)."""
+        return find_preview_path(path)
+
+    def _stat_cached(self, path):
+        """os.stat with a short TTL so bouncing between rows doesn't re-stat each file."""
+        now = time.monotonic()
+        cached = self._stat_cache.get(path)
+        if cached and now - cached[0] < _STAT_CACHE_TTL:
+            return cached[1]
+        st = os.stat(path)
+        if len(self._stat_cache) >= 1024:
+            self._stat_cache.pop(next(iter(self._stat_cache)))
+        self._stat_cache[path] = (now, st)
+        return st
+
+    def invalidate_details_cache(self, path=None):
+        """Drops cached details for `path` (or everything) after previews change."""
+        if path is None:
+            self._details_cache.clear()
+            self._stat_cache.clear()
+        else:
+            self._details_cache.pop(path, None)
+            self._stat_cache.pop(path, None)
+        self._details_dirty = True
+        # Directory mtimes can be coarse (FAT/SMB), so forget listings explicitly too
+        clear_preview_index()
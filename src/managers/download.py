@@ -1,17 +1,22 @@
 import os
 import re
-from PySide6.QtCore import QObject, Signal, Slot
+from collections import deque
+from PySide6.QtCore import QObject, Signal, Slot, QTimer
 from PySide6.QtWidgets import QMessageBox
 
 from ..workers import 模型DownloadWorker
 from ..ui_components import FileCollisionDialog
 
+# [Optimization] Single pass extracts the model id and, when present, the slug
+_CIVITAI_MODEL_URL_RE = re.compile(r'models/(?P<id>\d+)(?:/(?P<slug>[^/?#]+))?')
+
 class DownloadController(QObject):
     """
     Manages the download queue and 模型DownloadWorker.
     Emits signals for progress, completion, and queue status.
     """
     download_finished = Signal(str, str) # msg, file_path
+    download_hashed = Signal(str, str)   # file_path, sha256 (emitted before download_finished)
     download_error = Signal(str)         # err_msg
     progress_updated = Signal(str, str, int) # key, status, percent
     queue_updated = Signal(int)          # count
@@ -21,18 +26,28 @@ class DownloadController(QObject):
         self.parent_widget = parent_widget # For Dialogs
         self.task_monitor = task_monitor
         self.app_settings = app_settings
-        self.download_queue = []
+        self.download_queue = deque()
+        self._queued_urls = set() # URLs waiting in download_queue, for O(1) dedup
         self.current_worker = None
         self._is_paused = False
+        
+        # [Optimization] Coalesce worker progress into at most one UI update per 100 ms
+        self._progress_pending = {} # key -> (status, percent)
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(100)
+        self._progress_timer.timeout.connect(self._flush_progress)
 
     def add_download(self, url, target_dir):
+        """Queues a download. Returns False if the URL is already queued or running."""
+        if url in self._queued_urls or (self.is_running() and self.current_worker.task_key == url):
+            return False
+        self._queued_urls.add(url)
+
         display_name = "Unknown 模型"
-        match_slug = re.search(r'models/\d+/([^/?#]+)', url)
-        match_id = re.search(r'models/(\d+)', url)
-        if match_slug:
-            display_name = match_slug.group(1)
-        elif match_id:
-            display_name = f"模型 {match_id.group(1)}"
+        match = _CIVITAI_MODEL_URL_RE.search(url)
+        if match:
+            display_name = match.group('slug') or f"模型 {match.group('id')}"
         
         detail_info = f"{display_name} / {os.path.basename(target_dir)}"
 
@@ -49,13 +64,15 @@ class DownloadController(QObject):
         # We process if not paused and no worker running
         if not self._is_paused and not self.is_running():
             self.process_next()
+        return True
 
     def process_next(self):
         if self._is_paused: return
         if self.is_running(): return
         if not self.download_queue: return
 
-        task = self.download_queue.pop(0)
+        task = self.download_queue.popleft()
+        self._queued_urls.discard(task['url'])
         self.queue_updated.emit(len(self.download_queue))
 
         self.current_worker = 模型DownloadWorker(
@@ -103,19 +120,33 @@ class DownloadController(QObject):
             self.current_worker.set_collision_decision(dlg.result_value)
 
     def _on_worker_progress(self, key, status, percent):
+        self._progress_pending[key] = (status, percent)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _flush_progress(self):
+        self._progress_timer.stop()
+        if not self._progress_pending: return
+        pending, self._progress_pending = self._progress_pending, {}
+        for key, (status, percent) in pending.items():
+            self.task_monitor.update_task(key, status, percent)
+        # Status bar only needs the latest value
         self.progress_updated.emit(key, status, percent)
-        self.task_monitor.update_task(key, status, percent)
 
     def _on_worker_finished(self, msg, file_path):
+        self._flush_progress() # Don't let a stale update overwrite the final state
         # Update 任务 Monitor to 完成
         if self.current_worker:
              self.task_monitor.update_task(self.current_worker.task_key, "完成", 100)
+             if file_path and self.current_worker.sha256:
+                 self.download_hashed.emit(file_path, self.current_worker.sha256)
         
         self.download_finished.emit(msg, file_path)
         # Note: We do NOT auto-call process_next here to allow owner to inject logic (e.g. metadata chain)
         # The owner must call resume() or process_next() when ready.
 
     def _on_worker_error(self, err_msg):
+        self._flush_progress()
         if self.current_worker:
              self.task_monitor.update_task(self.current_worker.task_key, "错误", 0)
              
@@ -9,8 +9,6 @@ from PySide6.QtWidgets import (
     QGridLayout, QGroupBox, QLineEdit, QSplitter, QFileDialog, QMessageBox, QApplication, QTabWidget
 )
 from PySide6.QtCore import Qt, Signal
-from PIL import Image
-from PIL.PngImagePlugin import PngInfo
 
 from ..core import calculate_structure_path, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, CACHE_DIR_NAME
 from ..ui_components import SmartMediaWidget, ZoomWindow
@@ -34,6 +32,7 @@ class ExampleTabWidget(QWidget):
         self.example_images = []
         self.current_example_idx = 0
         self._gc_counter = 0 # [Memory] Counter for periodic GC
+        self._last_gc_ts = 0.0
         
         self.init_ui()
         
@@ -207,11 +206,13 @@ class ExampleTabWidget(QWidget):
         self.current_example_idx = (self.current_example_idx + delta) % len(self.example_images)
         self._update_ui()
         
-        # [Memory] Periodic GC
+        # [Memory] Occasional young-generation GC, at most every 30s of browsing
         self._gc_counter += 1
-        if self._gc_counter >= 10:
-            gc.collect()
+        now = time.monotonic()
+        if self._gc_counter >= 10 and now - self._last_gc_ts > 30:
+            gc.collect(1)
             self._gc_counter = 0
+            self._last_gc_ts = now
 
     def add_example_image(self):
         if not self.current_item_path: return
@@ -324,6 +325,8 @@ class ExampleTabWidget(QWidget):
             full_text = self.meta_viewer.get_formatted_parameters()
              
             # Open Image and Update Metadata
+            from PIL import Image # [Memory] Lazy: only needed when saving metadata
+            from PIL.PngImagePlugin import PngInfo
             img = Image.open(path)
             img.load()
             
@@ -7,7 +7,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 from .base import BaseManagerWidget
-from ..core import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+from ..core import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, filter_directories_by_mode
 from ..ui_components import SmartMediaWidget
 from ..ui.metadata_widget import MetadataViewerWidget
 from ..workers import LocalMetadataWorker
@@ -15,7 +15,7 @@ from ..workers import LocalMetadataWorker
 class GalleryManagerWidget(BaseManagerWidget):
     def __init__(self, directories, app_settings, parent=None):
         # [CRITICAL] STRICT FILTERING: Only allow directories with mode="gallery"
-        gallery_dirs = {k: v for k, v in directories.items() if v.get("mode") == "gallery"}
+        gallery_dirs = filter_directories_by_mode(directories, "gallery")
         
         # Extensions: Images and Videos
         extensions = list(IMAGE_EXTENSIONS) + list(VIDEO_EXTENSIONS)
@@ -82,9 +82,9 @@ class GalleryManagerWidget(BaseManagerWidget):
 
     # === Logic Implementation ===
 
-    def on_tree_select(self):
+    def _do_tree_select(self):
         """
-        Called when a tree item is selected.
+        Called once the tree selection settles (debounced in BaseManagerWidget).
         Updates preview and metadata.
         """
         item = self.tree.currentItem()
@@ -97,9 +97,8 @@ class GalleryManagerWidget(BaseManagerWidget):
             self.current_path = path
 
             # 0. Load Common 详情s (Info Panel)
-            filename, size_str, date_str, preview_path = self._load_common_file_details(path)
+            filename, ext, size_str, date_str, preview_path = self._load_common_file_details(path)
             
-            ext = os.path.splitext(filename)[1]
             self.info_labels["名称"].setText(filename)
             self.info_labels["Ext"].setText(ext)
             self.info_labels["大小"].setText(size_str)
@@ -123,12 +122,7 @@ class GalleryManagerWidget(BaseManagerWidget):
             self.txt_raw.clear()
             self.current_path = None
             
-            # Clear Info Panel
-            self.info_labels["名称"].setText("-")
-            self.info_labels["Ext"].setText("-")
-            self.info_labels["大小"].setText("-")
-            self.info_labels["路径"].setText("-")
-            self.info_labels["日期"].setText("-")
+            self._clear_info_labels()
 
     def _on_meta_ready(self, path, meta):
         """
@@ -170,5 +164,5 @@ class GalleryManagerWidget(BaseManagerWidget):
 
     def set_directories(self, directories):
         """Updates the directories and refreshes the combo box, enforcing strict filtering."""
-        gallery_dirs = {k: v for k, v in directories.items() if v.get("mode") == "gallery"}
+        gallery_dirs = filter_directories_by_mode(directories, "gallery")
         super().set_directories(gallery_dirs)
@@ -1,21 +1,22 @@
 import os
+import sys
 import shutil
-import json
-import re
 import time
 import gc
+import ctypes
 import logging
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextBrowser, QTextEdit, 
     QFormLayout, QGridLayout, QTabWidget, QStackedWidget, QMessageBox, QGroupBox, QLineEdit, QFileDialog, QInputDialog,
     QSplitter, QApplication
 )
-from PySide6.QtCore import Qt, QTimer, QMimeData
+from PySide6.QtCore import Qt, QTimer, QMimeData, QThreadPool
 from PySide6.QtGui import QFont
+from PySide6.QtMultimedia import QMediaPlayer
 
 from .base import BaseManagerWidget
 from ..core import (
-    calculate_structure_path, HAS_PILLOW, HAS_MARKDOWN,
+    filter_directories_by_mode, HAS_PILLOW, HAS_MARKDOWN,
     SUPPORTED_EXTENSIONS, PREVIEW_EXTENSIONS, VIDEO_EXTENSIONS, IMAGE_EXTENSIONS
 )
 from ..ui_components import (
@@ -23,52 +24,131 @@ from ..ui_components import (
     FileCollisionDialog, OverwriteConfirmDialog, ZoomWindow
 )
 from .example import ExampleTabWidget
-from ..workers import ImageLoader
+from ..workers import ImageLoader, DetailProbeWorker
 from .download import DownloadController
 from ..controllers.metadata_controller import MetadataController
 from ..utils.comfy_node_builder import ComfyNodeBuilder
 
+# [Debug] GC pause statistics, fed by a gc.callbacks hook
+_GC_STATS = {"collections": 0, "last_pause_ms": 0.0, "max_pause_ms": 0.0, "_start": 0.0}
+
+def _track_gc_pause(phase, info):
+    if phase == "start":
+        _GC_STATS["_start"] = time.perf_counter()
+    else:
+        pause_ms = (time.perf_counter() - _GC_STATS["_start"]) * 1000
+        _GC_STATS["collections"] += 1
+        _GC_STATS["last_pause_ms"] = pause_ms
+        if pause_ms > _GC_STATS["max_pause_ms"]: _GC_STATS["max_pause_ms"] = pause_ms
+
+_GC_RSS_GROWTH = 64 * 1024 * 1024 # Full collection only after this much growth
+
+# [Optimization] RSS probes are resolved once at import, not on every idle tick
 try:
-    from PIL import Image
-    from PIL.PngImagePlugin import PngInfo
-except  ImportError:
-    pass
-try:
-    import markdown
+    import psutil
+    HAS_PSUTIL = True
 except ImportError:
-    pass
+    HAS_PSUTIL = False
+
+_win_memory_info = None
+if sys.platform == "win32" and not HAS_PSUTIL:
+    try:
+        from ctypes import wintypes
+
+        class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        _kernel32 = ctypes.WinDLL("kernel32")
+        _kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        _win_memory_info = _kernel32.K32GetProcessMemoryInfo # Windows 7+
+        _win_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+        _win_memory_info.restype = wintypes.BOOL
+    except (OSError, AttributeError):
+        _win_memory_info = None
+
+def _current_rss():
+    """Resident set size in bytes, or None when it can't be measured cheaply."""
+    if HAS_PSUTIL:
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            return None
+    if _win_memory_info is not None:
+        counters = _PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if _win_memory_info(_kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
 
 class ModelManagerWidget(BaseManagerWidget):
+    # [Optimization] Invariant state -> label map; keyed by enum member so it never relies on int equality
+    _PLAYBACK_STATES = {
+        QMediaPlayer.StoppedState: "Stopped",
+        QMediaPlayer.PlayingState: "Playing",
+        QMediaPlayer.PausedState: "Paused",
+    }
+
     def __init__(self, directories, app_settings, task_monitor, parent_window=None):
         self.task_monitor = task_monitor
         self.parent_window = parent_window
         self.last_download_dir = None
 
         # Filter directories for 'model' mode
-        model_dirs = {k: v for k, v in directories.items() if v.get("mode", "model") == "model"}
+        model_dirs = filter_directories_by_mode(directories, "model")
         super().__init__(model_dirs, SUPPORTED_EXTENSIONS["model"], app_settings)
         
-        self.metadata_queue = []
         self.selected_model_paths = []
-        self._gc_counter = 0 # [Memory] Counter for periodic GC
+        self._folder_cfg_cache = {} # [Optimization] alias -> (model_type, root_path)
+        self._probe_gen = 0 # [Optimization] Latest detail probe; older results are dropped
+        
+        # [Memory] Debounced idle GC instead of collecting on every selection
+        self._gc_timer = QTimer(self)
+        self._gc_timer.setSingleShot(True)
+        self._gc_timer.setInterval(2000)
+        self._gc_timer.timeout.connect(self._idle_gc)
+        self._last_gc_rss = 0 # RSS after the last idle collection
+        if _track_gc_pause not in gc.callbacks:
+            gc.callbacks.append(_track_gc_pause)
+        
+        # [Optimization] Downloads finishing close together share one directory rescan
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(500)
+        self._refresh_timer.timeout.connect(self.refresh_list)
         
         # Download Controller
         self.downl_controller = DownloadController(self, task_monitor, app_settings)
         self.downl_controller.download_finished.connect(self._on_download_finished_controller)
         self.downl_controller.download_error.connect(self._on_download_error_controller)
-        self.downl_controller.progress_updated.connect(lambda k, s, p: self.show_status_message(f"{s}: {p}%", 0))
+        self.downl_controller.progress_updated.connect(self._on_download_progress)
         
         # Metadata Controller
         self.metadata_controller = MetadataController(app_settings, directories, self)
-        self.metadata_controller.status_message.connect(lambda msg, dur: self.show_status_message(msg, dur))
+        self.metadata_controller.warmup()
+        # [Memory] Bound slots instead of lambdas so no closure keeps `self` alive
+        self.metadata_controller.status_message.connect(self.show_status_message)
         self.metadata_controller.task_progress.connect(self.task_monitor.update_task)
-        self.metadata_controller.batch_started.connect(lambda paths: self.task_monitor.add_tasks(paths, task_type="Auto Match"))
+        self.metadata_controller.batch_started.connect(self._on_metadata_batch_started)
         self.metadata_controller.model_processed.connect(self._on_model_processed)
         self.metadata_controller.batch_processed.connect(self._on_batch_processed)
+        # [Optimization] Hash computed during download lands in the cache before auto-match
+        self.downl_controller.download_hashed.connect(self.metadata_controller.store_precomputed_hash)
         
     def set_directories(self, directories):
         # Filter directories for 'model' mode
-        model_dirs = {k: v for k, v in directories.items() if v.get("mode", "model") == "model"}
+        model_dirs = filter_directories_by_mode(directories, "model")
+        self._folder_cfg_cache.clear()
         super().set_directories(model_dirs)
         if self.directories:
             self.metadata_controller.directories = directories
@@ -91,18 +171,18 @@ class ModelManagerWidget(BaseManagerWidget):
         info = super().get_debug_info()
         
         # Player Stats
-        player_state = "Stopped"
-        if self.preview_lbl and self.preview_lbl.media_player:
-            state = self.preview_lbl.media_player.playbackState()
-            if state == 1: player_state = "Playing" 
-            elif state == 2: player_state = "Paused"
+        player = self.preview_lbl.media_player if self.preview_lbl else None
+        player_state = self._PLAYBACK_STATES.get(player.playbackState(), "Stopped") if player else "Stopped"
             
         info.update({
             "download_queue_size": len(self.downl_controller.download_queue),
             "metadata_queue_size": len(self.metadata_controller.queue),
             "video_player_active": (self.preview_lbl.media_player is not None),
             "video_player_state": player_state,
-            "gc_counter": self._gc_counter,
+            "gc_pending": self._gc_timer.isActive(),
+            "gc_collections": _GC_STATS["collections"],
+            "gc_last_pause_ms": round(_GC_STATS["last_pause_ms"], 2),
+            "gc_max_pause_ms": round(_GC_STATS["max_pause_ms"], 2),
             "example_tab_stats": self.tab_example.get_debug_info() if hasattr(self, 'tab_example') else {}
         })
         return info
@@ -111,6 +191,12 @@ class ModelManagerWidget(BaseManagerWidget):
 
         # [Refactor] Use shared setup
         self._setup_info_panel(["Ext"])
+        # [Optimization] Direct references for the per-selection hot path
+        self.info_name = self.info_labels["名称"]
+        self.info_ext = self.info_labels["Ext"]
+        self.info_size = self.info_labels["大小"]
+        self.info_path = self.info_labels["路径"]
+        self.info_date = self.info_labels["日期"]
         
         self.preview_lbl = SmartMediaWidget(loader=self.image_loader_thread, player_type="preview")
         self.preview_lbl.setMinimumSize(100, 100) 
@@ -145,8 +231,8 @@ class ModelManagerWidget(BaseManagerWidget):
         btn_download = QPushButton("⬇️ 下载模型")
         btn_download.setToolTip("从URL下载新模型")
         
-        btn_auto.clicked.connect(lambda: self.run_civitai("auto"))
-        btn_manual.clicked.connect(lambda: self.run_civitai("manual"))
+        btn_auto.clicked.connect(self.run_auto_match)
+        btn_manual.clicked.connect(self.run_manual_match)
         btn_download.clicked.connect(self.download_model_dialog)
 
         meta_btns.addWidget(btn_auto, 0, 0)
@@ -167,6 +253,17 @@ class ModelManagerWidget(BaseManagerWidget):
 
     # === Interaction Logic ===
 
+    def _resolve_folder_cfg(self, alias):
+        """Returns (model_type, root_path) for a folder alias, cached until directories change."""
+        cfg = self._folder_cfg_cache.get(alias)
+        if cfg is None:
+            folder_config = self.directories.get(alias, {})
+            # [Feature] Support ComfyUI Root Override
+            root_path = folder_config.get("comfy_root", "") or folder_config.get("path", "")
+            cfg = (folder_config.get("model_type", ""), root_path)
+            self._folder_cfg_cache[alias] = cfg
+        return cfg
+
     def copy_comfy_node(self):
         """
         [Role]
@@ -175,117 +272,144 @@ class ModelManagerWidget(BaseManagerWidget):
         and uses ComfyNodeBuilder to creating the clipboard content.
 
         [Flow]
-        1. Validate selection.
+        1. Validate selection (multi-selection is handed to copy_comfy_nodes_batch).
         2. Get 'model_type' (e.g. checkpoints) from the current folder's config.
         3. Generate HTML clipboard data.
         4. Set to System Clipboard.
         """
+        self.flush_pending_selection()
+        if len(self.selected_model_paths) > 1:
+            self.copy_comfy_nodes_batch()
+            return
+
         if not self.current_path or not os.path.exists(self.current_path):
             self.show_status_message("No model selected or file not found.", 3000)
             return
 
-        # Get 模型 类型 from current folder config
-        current_root_alias = self.folder_combo.currentText()
-        folder_config = self.directories.get(current_root_alias, {})
-        model_type = folder_config.get("model_type", "")
+        model_type, root_path = self._resolve_current_folder_cfg()
+        if not model_type: return
+            
+        data, mime_type = ComfyNodeBuilder.create_html_clipboard(self.current_path, model_type, root_path)
+        self._set_node_clipboard(data, mime_type)
         
+        msg = "Embedding copied!" if model_type == "embeddings" else "ComfyUI Node copied to clipboard!"
+        self.show_status_message(msg, 3000)
+
+    def copy_comfy_nodes_batch(self):
+        """Copies every selected model as one clipboard payload (one Ctrl+V in ComfyUI)."""
+        paths = [p for p in self.selected_model_paths if os.path.exists(p)]
+        if not paths:
+            self.show_status_message("No model selected or file not found.", 3000)
+            return
+
+        model_type, root_path = self._resolve_current_folder_cfg()
+        if not model_type: return
+
+        data, mime_type = ComfyNodeBuilder.create_html_clipboard_batch(paths, model_type, root_path)
+        self._set_node_clipboard(data, mime_type)
+        
+        kind = "embeddings" if model_type == "embeddings" else "ComfyUI Nodes"
+        self.show_status_message(f"{len(paths)} {kind} copied to clipboard!", 3000)
+
+    def _resolve_current_folder_cfg(self):
+        """(model_type, root_path) of the current folder; warns and returns ('', '') if unset."""
+        current_root_alias = self.folder_combo.currentText()
+        model_type, root_path = self._resolve_folder_cfg(current_root_alias)
         if not model_type:
              QMessageBox.warning(self, "Configuration Required", 
                                  f"模型 类型 is not configured for '{current_root_alias}'.\nPlease set it in 设置 -> 已注册文件夹.")
-             return
-            
-        # [Feature] Support ComfyUI Root Override
-        root_path = folder_config.get("comfy_root", "")
-        if not root_path:
-            root_path = folder_config.get("path", "")
-            
-        data, mime_type = ComfyNodeBuilder.create_html_clipboard(self.current_path, model_type, root_path)
-        print(f"[DEBUG] Copy Node Payload ({mime_type}): {data}") 
-        
-        clipboard = QApplication.clipboard()
+        return model_type, root_path
+
+    def _set_node_clipboard(self, data, mime_type):
+        logging.debug("Copy Node payload: %s, %d chars", mime_type, len(data))
         mime_data = QMimeData()
-        
         if mime_type == "text/html":
             mime_data.setHtml(data)
             mime_data.setText("ComfyUI Node") # Fallback text
         else:
             mime_data.setText(data)
-            
-        clipboard.setMimeData(mime_data)
-        
-        msg = "Embedding copied!" if model_type == "embeddings" else "ComfyUI Node copied to clipboard!"
-        self.show_status_message(msg, 3000)
-        # Optional: Toast notification if available, but status bar is fine.
+        QApplication.clipboard().setMimeData(mime_data)
     
-    def on_tree_select(self):
+    def _do_tree_select(self):
         items = self.tree.selectedItems()
         if not items: return
-        selected_paths = []
-        for item in items:
-            path = item.data(0, Qt.UserRole)
-            type_ = item.data(0, Qt.UserRole + 1)
-            if type_ == "file" and path: 
-                selected_paths.append(path)
-        self.selected_model_paths = selected_paths
+        # [Optimization] Ctrl+A can select thousands of rows; keep the role lookups out of the loop
+        path_role, type_role = Qt.UserRole, Qt.UserRole + 1
+        self.selected_model_paths = [
+            path for item in items
+            if item.data(0, type_role) == "file" and (path := item.data(0, path_role))
+        ]
         current_item = self.tree.currentItem()
         if current_item:
             path = current_item.data(0, Qt.UserRole)
             type_ = current_item.data(0, Qt.UserRole + 1)
+            # [Optimization] Re-clicking the row already shown is a no-op unless something changed
+            if type_ == "file" and path == self.current_path and not self._details_dirty:
+                return
             
             # [Memory] Fast cleanup of previous view
             self.image_loader_thread.clear_queue() # Cancel pending loads
-            self.preview_lbl.clear_memory()
-            self.tab_example.unload_current_examples()
-            
-            gc.collect() # Force immediate release (User request)
+            if type_ != "file":
+                # File -> file keeps the preview's player/pixmap and the example tab;
+                # set_media/load_examples replace them in place once details arrive
+                self.preview_lbl.clear_memory()
+                self.tab_example.unload_current_examples()
+            self._gc_timer.start() # [Memory] Collect once selection settles
             
             if type_ == "file" and path:
                  self.current_path = path # [Fix] Update current path tracker
-                 self._load_details(path)
-                 
-
-                 
-            elif type_ == "dict":
-                 # Assuming self.lbl_info is a QLabel to display messages
-                 # If not, this line might need adjustment based on actual UI
-                 self.info_labels["名称"].setText("Select a model file to see details.")
-                 self.info_labels["Ext"].setText("-")
-                 self.info_labels["大小"].setText("-")
-                 self.info_labels["路径"].setText("-")
-                 self.info_labels["日期"].setText("-")
-                 self.preview_lbl.set_media(None)
-                 self.tab_note.set_text("")
+                 self._request_details(path)
             else:
-                 self.info_labels["名称"].setText("Select a model file to see details.")
-                 self.info_labels["Ext"].setText("-")
-                 self.info_labels["大小"].setText("-")
-                 self.info_labels["路径"].setText("-")
-                 self.info_labels["日期"].setText("-")
-                 self.preview_lbl.set_media(None)
-                 self.tab_note.set_text("")
-
-    def _load_details(self, path):
+                 self._reset_info_labels()
+
+    def _reset_info_labels(self, name_msg="Select a model file to see details."):
+        """Clears the detail panel for non-file selections with a single repaint."""
+        self.setUpdatesEnabled(False)
+        try:
+            self._clear_info_labels(name_msg)
+            self.preview_lbl.set_media(None)
+            self.tab_note.set_text("")
+        finally:
+            self.setUpdatesEnabled(True)
+        self._details_dirty = True
+
+    def _apply_info(self, name, ext, size, path, date):
+        """Sets all info labels under one layout/repaint pass."""
+        panel = self.info_name.parentWidget()
+        panel.setUpdatesEnabled(False)
+        try:
+            self.info_name.setText(name)
+            self.info_ext.setText(ext)
+            self.info_size.setText(size)
+            self.info_path.setText(path)
+            self.info_date.setText(date)
+        finally:
+            panel.setUpdatesEnabled(True)
+
+    def _request_details(self, path):
+        """Probes stat/preview on the thread pool; the reply drives _load_details."""
+        self._probe_gen += 1
+        worker = DetailProbeWorker(path, self._probe_gen)
+        worker.signals.probed.connect(self._on_details_probed)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_details_probed(self, generation, path, probe):
+        if generation != self._probe_gen or path != self.current_path:
+            return # Superseded by a newer selection
+        self._load_details(path, probe)
+
+    def _load_details(self, path, probe=None):
         # [Refactor] Use shared logic from BaseManagerWidget
-        filename, size_str, date_str, preview_path = self._load_common_file_details(path)
+        filename, ext, size_str, date_str, preview_path = self._load_common_file_details(path, probe)
         
         # Update Info Labels
-        ext = os.path.splitext(filename)[1]
-        self.info_labels["名称"].setText(filename)
-        self.info_labels["Ext"].setText(ext)
-        self.info_labels["大小"].setText(size_str)
-        self.info_labels["日期"].setText(date_str)
-        self.info_labels["路径"].setText(path)
+        self._apply_info(filename, ext, size_str, path, date_str)
         
         self.preview_lbl.set_media(preview_path)
         
-        # [Memory] Periodic GC for model browsing
-        self._gc_counter += 1
-        if self._gc_counter >= 20: 
-            gc.collect()
-            self._gc_counter = 0
-        
         # Note Loading (Standardized)
         self.load_content_data(path)
+        self._details_dirty = False
 
 
 
@@ -294,38 +418,53 @@ class ModelManagerWidget(BaseManagerWidget):
 
 
 
-    def _save_json_direct(self, model_path, content):
-        # [Fix] Added mode argument
-        cache_dir = calculate_structure_path(model_path, self.get_cache_dir(), self.directories, mode=self.get_mode())
-        if not os.path.exists(cache_dir): os.makedirs(cache_dir)
-        model_name = os.path.splitext(os.path.basename(model_path))[0]
-        json_path = os.path.join(cache_dir, model_name + ".json")
-        try:
-            data = {}
-            if os.path.exists(json_path):
-                with open(json_path, 'r', encoding='utf-8') as f: data = json.load(f)
-            data["user_note"] = content
-            with open(json_path, 'w', encoding='utf-8') as f: json.dump(data, f, indent=4, ensure_ascii=False)
-        except Exception as e: logging.error(f"Save 错误: {e}")
-
-
+    def _idle_gc(self):
+        """Collects garbage after browsing pauses and returns freed heap to the OS."""
+        # [Memory] Previews and examples are freed by refcounting as soon as they are
+        # unloaded; a full collection is only worth its pause when RSS has really grown.
+        rss = _current_rss()
+        if rss is not None and rss - self._last_gc_rss < _GC_RSS_GROWTH:
+            gc.collect(0) # Young generation only: cheap, catches fresh cycles
+            return
+        gc.collect()
+        # glibc keeps freed image buffers in its arenas unless asked to trim
+        if sys.platform.startswith("linux"):
+            try:
+                ctypes.CDLL("libc.so.6").malloc_trim(0)
+            except (OSError, AttributeError):
+                pass
+        self._last_gc_rss = _current_rss() or 0
 
     # === Civitai / Download Logic ===
     def run_civitai(self, mode, targets=None, manual_url_override=None, overwrite_behavior_override=None):
         if targets is None:
+            self.flush_pending_selection() # Selection may still be settling
             targets = self.selected_model_paths
         
         # Delegate to Controller
         self.metadata_controller.run_civitai(mode, targets, manual_url_override, overwrite_behavior_override)
 
+    def run_auto_match(self):
+        self.run_civitai("auto")
+
+    def run_manual_match(self):
+        self.run_civitai("manual")
+
+    def _on_metadata_batch_started(self, paths):
+        self.task_monitor.add_tasks(paths, task_type="Auto Match")
+
+    def _on_download_progress(self, key, status, percent):
+        self.show_status_message(f"{status}: {percent}%", 0)
+
     def _on_model_processed(self, success, msg, data, model_path):
         if success:
             desc = data.get("description", "")
             self.save_note_for_path(model_path, desc, silent=True)
+            self.invalidate_details_cache(model_path) # Worker may have added a preview
             if self.current_path == model_path:
-                self.tab_note.set_text(desc)
-                self.tab_example.load_examples(model_path)
-                QTimer.singleShot(200, lambda: self._load_details(model_path))
+                # The worker emits only after previews/thumbnail are on disk, so no settle delay.
+                # One details pass refreshes info, preview, the note just saved and the examples.
+                self._request_details(model_path)
 
     def _on_batch_processed(self):
         self.show_status_message("Batch 已处理.")
@@ -334,7 +473,7 @@ class ModelManagerWidget(BaseManagerWidget):
 
     def download_model_dialog(self):
         default_dir = None
-        if self.last_download_dir and os.path.exists(self.last_download_dir):
+        if self.last_download_dir and os.path.isdir(self.last_download_dir):
             default_dir = self.last_download_dir
         if not default_dir:
             current_item = self.tree.currentItem()
@@ -353,17 +492,21 @@ class ModelManagerWidget(BaseManagerWidget):
         if dlg.exec():
             url, target_dir = dlg.get_data()
             if not url: return
-            if not os.path.exists(target_dir):
+            if not os.path.isdir(target_dir): # A file path would pass exists() and fail later in the worker
                 QMessageBox.warning(self, "错误", "Selected directory does not exist.")
                 return
 
             self.last_download_dir = target_dir
-            self.downl_controller.add_download(url, target_dir)
-            self.show_status_message(f"Added to queue: {os.path.basename(target_dir)}")
+            if self.downl_controller.add_download(url, target_dir):
+                self.show_status_message(f"Added to queue: {os.path.basename(target_dir)}")
+            else:
+                self.show_status_message("This URL is already in the download queue.")
 
     def _on_download_finished_controller(self, msg, file_path):
         self.show_status_message(msg)
-        self.refresh_list()
+        # [Optimization] Slot the new file into the tree; rescan only when that isn't possible
+        if not file_path or not self.insert_file_item(file_path):
+            self._refresh_timer.start()
         
         # Auto-match Logic
         chain_started = False
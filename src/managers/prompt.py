@@ -1,29 +1,42 @@
 import os
-import json
 import logging
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, 
-    QAbstractItemView, QSplitter, QPushButton, QInputDialog, QMessageBox, QTextEdit, QDialog, QDialogButtonBox, QFileDialog, QApplication
+    QAbstractItemView, QSplitter, QPushButton, QInputDialog, QMessageBox, QTextEdit, QPlainTextEdit, QDialog, QDialogButtonBox, QFileDialog, QApplication
 )
-from PySide6.QtGui import QClipboard, QTextOption
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QClipboard, QTextOption, QPainter, QColor, QPen, QPixmap, QPixmapCache
+from PySide6.QtCore import Qt, QSize, QRect, QPoint, QThreadPool, QEvent, QTimer
 
 from .base import BaseManagerWidget
 from .example import ExampleTabWidget
 from ..ui_components import MarkdownNoteWidget
-from ..core import SUPPORTED_EXTENSIONS, CACHE_DIR_NAME, calculate_structure_path
+from ..workers import PromptFileLoader, JsonWriter
+from ..core import SUPPORTED_EXTENSIONS, CACHE_DIR_NAME, calculate_structure_path, filter_directories_by_mode, json_dumps_bytes
 import uuid
 import shutil
+import hashlib
 
 from PySide6.QtCore import Signal
 from PySide6.QtWidgets import QSizePolicy
 
+# [Optimization] Value types shared by every prompt row instead of rebuilt per row / per paint
+_SELECTION_PEN = QPen(QColor("dodgerblue"), 3) # Thick Blue Border
+_COPY_BUTTON_POLICY = QSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+_IGNORED_MIN_POLICY = QSizePolicy(QSizePolicy.Ignored, QSizePolicy.Minimum)
+
 # [Helper Class for Event Propagation & Advanced Wrapping]
-class PromptTextEdit(QTextEdit):
+# [Optimization] QPlainTextEdit: same read-only view with selection, scrolling and QSS,
+# but a line-based plain-text layout instead of the rich-text engine
+class PromptTextEdit(QPlainTextEdit):
     clicked = Signal()
     
+    HEIGHT_CACHE_SIZE = 8
+    
     def __init__(self, text, bg_color="#f9f9f9", border_color="#ddd", parent=None):
         super().__init__(parent)
+        self._height_cache = {} # [Optimization] width -> height
+        self._max_h = None # [Optimization] 10-line cap; depends only on the font
+        self._text = ""
         self.setReadOnly(True)
         self.setText(text)
         
@@ -33,10 +46,8 @@ class PromptTextEdit(QTextEdit):
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         
         # Wrapping Logic
-        self.setLineWrapMode(QTextEdit.WidgetWidth)
-        option = self.document().defaultTextOption()
-        option.setWrapMode(QTextOption.WrapAnywhere) 
-        self.document().setDefaultTextOption(option)
+        self.setLineWrapMode(QPlainTextEdit.WidgetWidth)
+        self.setWordWrapMode(QTextOption.WrapAnywhere) # QPlainTextEdit applies this over the document option
         self.document().setDocumentMargin(0) # Remove internal document margin
         
         # Style
@@ -44,21 +55,35 @@ class PromptTextEdit(QTextEdit):
         # Removed inline stylesheet
         
         # Size Policy
-        self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Minimum)
-        
+        self.setSizePolicy(_IGNORED_MIN_POLICY)
+        
+    def setText(self, text):
+        # Prompts are plain text: "<lora:...>" must never be sniffed as HTML,
+        # which also keeps the font-metrics measurement below exact
+        self._text = text
+        self._invalidate_height_cache()
+        super().setPlainText(text)
+
+    def _invalidate_height_cache(self):
+        self._height_cache.clear()
+
+    def changeEvent(self, event):
+        # Font/style changes alter line spacing and wrapping
+        if event.type() in (QEvent.FontChange, QEvent.StyleChange):
+            self._max_h = None
+            self._invalidate_height_cache()
+        super().changeEvent(event)
+
     def mousePressEvent(self, event):
         self.clicked.emit()
         super().mousePressEvent(event)
         
     def sizeHint(self):
-        # Calculate height based on document
-        doc_height = self.document().size().height()
-        
-        # Calculate Max Height (approx 10 lines) - Increased x2
-        fm = self.fontMetrics()
-        line_height = fm.lineSpacing()
-        max_h = (line_height * 10) + 12 
+        # Calculate height based on the text at the current width
+        # (a plain-text document reports its size in lines, not pixels)
+        width = self.viewport().width()
         
+        # Max Height is approx 10 lines - Increased x2
         # Add minimal buffer for border/padding (4px padding * 2 = 8px + borders)
         # Since document margin is 0, doc_height is just text.
         # We need to add the CSS padding we set above (4px).
@@ -66,29 +91,36 @@ class PromptTextEdit(QTextEdit):
         # But user said still too much.
         # Let's try matching exactly: doc_height + 10 (padding 4+4 + border 1+1).
         # If doc_height includes line spacing, it should be fine.
-        
-        final_height = min(int(doc_height + 10), max_h)
-        return QSize(self.viewport().width(), final_height)
+        return QSize(width, self.get_height_for_width(width))
         
     
     def get_height_for_width(self, width):
         # Calculate height for a specific width without resizing
-        # We clone the document to test layout
-        doc = self.document().clone()
-        doc.setTextWidth(width)
-        
-        doc_height = doc.size().height()
+        # [Optimization] Resizes and list refreshes ask for the same widths again; answer from cache
+        cached = self._height_cache.get(width)
+        if cached is not None:
+            return cached
         
+        # [Optimization] A font-metrics wrap pass instead of cloning and laying out the document;
+        # for plain text with WrapAnywhere and no document margin the heights match exactly
         fm = self.fontMetrics()
-        line_height = fm.lineSpacing()
-        max_h = (line_height * 10) + 12
+        doc_height = fm.boundingRect(QRect(0, 0, width, 0), Qt.TextWordWrap | Qt.TextWrapAnywhere, self._text).height()
+        
+        # Computed lazily: the QSS font is only applied once the widget is polished
+        max_h = self._max_h
+        if max_h is None:
+            max_h = self._max_h = (fm.lineSpacing() * 10) + 12
         
         final_height = min(int(doc_height + 10), max_h)
+        if len(self._height_cache) >= self.HEIGHT_CACHE_SIZE:
+            self._height_cache.clear()
+        self._height_cache[width] = final_height
         return final_height
 
 class PromptListItemWidget(QWidget):
     copy_requested = Signal(str, str) # text, type
     clicked = Signal() # New signal for selection
+    MIN_HEIGHT = 120
     
     def __init__(self, positive, negative, tags, parent=None):
         super().__init__(parent)
@@ -96,6 +128,8 @@ class PromptListItemWidget(QWidget):
         self.negative = negative
         self.tags = tags
         self._is_selected = False
+        self._calc_cache = {} # [Optimization] width -> total height
+        self.hint_width = -1 # [Optimization] Width the list item's size hint was last set for
         
         # ... (Layout setup is done in UI, but we need to know structure for calc)
         # Main margins: 4
@@ -123,7 +157,7 @@ class PromptListItemWidget(QWidget):
         
         btn_copy_pos = QPushButton("📋")
         btn_copy_pos.setFixedWidth(28)
-        btn_copy_pos.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+        btn_copy_pos.setSizePolicy(_COPY_BUTTON_POLICY)
         btn_copy_pos.setToolTip("Copy Positive")
         btn_copy_pos.setCursor(Qt.PointingHandCursor)
         btn_copy_pos.clicked.connect(lambda: self.copy_requested.emit(self.positive, "Positive"))
@@ -144,7 +178,7 @@ class PromptListItemWidget(QWidget):
         
         btn_copy_neg = QPushButton("📋")
         btn_copy_neg.setFixedWidth(28)
-        btn_copy_neg.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+        btn_copy_neg.setSizePolicy(_COPY_BUTTON_POLICY)
         btn_copy_neg.setToolTip("Copy Negative")
         btn_copy_neg.setCursor(Qt.PointingHandCursor)
         btn_copy_neg.clicked.connect(lambda: self.copy_requested.emit(self.negative, "Negative"))
@@ -170,15 +204,30 @@ class PromptListItemWidget(QWidget):
 
             
         # Size Policy
-        self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Minimum)
+        self.setSizePolicy(_IGNORED_MIN_POLICY)
         
         # [Enhancement] Enforce minimum height for the whole widget
-        self.setMinimumHeight(120) # Approx 2x the original visual feel for empty/small items
+        self.setMinimumHeight(self.MIN_HEIGHT) # Approx 2x the original visual feel for empty/small items
 
     # ... (rest of methods)
 
     def calculate_height(self, width):
         # Calculate full height for a given width
+        cached = self._calc_cache.get(width)
+        if cached is not None:
+            return cached
+        if len(self._calc_cache) >= PromptTextEdit.HEIGHT_CACHE_SIZE:
+            self._calc_cache.clear()
+        height = self._calc_cache[width] = self._calculate_height(width)
+        return height
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.FontChange, QEvent.StyleChange):
+            self._calc_cache.clear()
+            self.hint_width = -1
+        super().changeEvent(event)
+
+    def _calculate_height(self, width):
         # Width available for text:
         # parent_width - margins_left_right (4+4=8) - button (28) - spacing (10)
         text_avail_width = width - 8 - 28 - 10
@@ -210,7 +259,7 @@ class PromptListItemWidget(QWidget):
         total_h += 4 # Bottom margin
         
         # [Enhancement] Enforce minimum height here too
-        return max(total_h, 120)
+        return max(total_h, self.MIN_HEIGHT)
 
     def _propagate_click(self):
         # Emit clicked signal so parent can handle selection
@@ -218,48 +267,42 @@ class PromptListItemWidget(QWidget):
 
     def mousePressEvent(self, event):
         # If user clicks background, select this row.
+        # [Optimization] The manager binds `clicked` to this row's QListWidgetItem when it builds
+        # the widget, so no parent walk / itemWidget scan over every row is needed here
         self.clicked.emit()
         super().mousePressEvent(event)
-        
-        # Find parent QListWidget
-        parent = self.parent()
-        while parent and not isinstance(parent, QListWidget):
-            parent = parent.parent()
-            
-        if isinstance(parent, QListWidget):
-             # Find item for this widget
-             # This is O(N) but reliable. Or use itemAt?
-             # Actually, since this widget IS the item widget:
-             # We can iterate to find which item has this widget.
-             # Or more robust:
-             # Just emit a signal that Manager catches? No, Manager connects to ItemSelectionChanged.
-             # We need to trigger ItemSelectionChanged.
-             
-             # Efficient way:
-             for i in range(parent.count()):
-                 it = parent.item(i)
-                 if parent.itemWidget(it) == self:
-                     parent.setCurrentItem(it)
-                     break
-        
-        super().mousePressEvent(event)
 
     def paintEvent(self, event):
-        from PySide6.QtGui import QPainter, QColor, QPen
         super().paintEvent(event)
         
         if self._is_selected:
+            # [Optimization] Render the antialiased border once per row size and blit it on repaints
             painter = QPainter(self)
+            painter.drawPixmap(0, 0, self._selection_border(self.size(), self.devicePixelRatioF()))
+
+    @staticmethod
+    def _selection_border(size, dpr):
+        key = f"prompt_sel_border_{size.width()}x{size.height()}@{dpr}"
+        pix = QPixmapCache.find(key)
+        if pix is None or pix.isNull():
+            pix = QPixmap(size * dpr)
+            pix.setDevicePixelRatio(dpr)
+            pix.fill(Qt.transparent)
+            
+            painter = QPainter(pix)
             painter.setRenderHint(QPainter.Antialiasing)
             
             # Draw Selection Border
-            rect = self.rect()
+            rect = QRect(QPoint(0, 0), size)
             rect.adjust(1, 1, -1, -1) # adjust slightly
-            pen = QPen(QColor("dodgerblue"), 3) # Thick Blue Border
-            painter.setPen(pen)
+            painter.setPen(_SELECTION_PEN)
             painter.drawRoundedRect(rect, 4, 4)
+            painter.end()
+            QPixmapCache.insert(key, pix)
+        return pix
 
     def set_selected(self, selected):
+        if selected == self._is_selected: return # Nothing to repaint
         self._is_selected = selected
         self.update() # Trigger repaint
 
@@ -273,20 +316,16 @@ class PromptEditDialog(QDialog):
         # Positive
         layout.addWidget(QLabel("正面提示词:"))
         self.txt_positive = QTextEdit()
-        self.txt_positive.setPlainText(positive)
-        self.txt_positive.setPlainText(positive)
+        if positive: self.txt_positive.setPlainText(positive) # An empty document needs no populate pass
         self.txt_positive.setStyleSheet("background-color: #f0fff0;") # Keeping inline for dynamic hint
         layout.addWidget(self.txt_positive)
-        layout.addWidget(self.txt_positive)
         
         # Negative
         layout.addWidget(QLabel("负面提示词:"))
         self.txt_negative = QTextEdit()
-        self.txt_negative.setPlainText(negative)
-        self.txt_negative.setPlainText(negative)
+        if negative: self.txt_negative.setPlainText(negative) # An empty document needs no populate pass
         self.txt_negative.setStyleSheet("background-color: #fff0f0;") # Keeping inline for dynamic hint
         layout.addWidget(self.txt_negative)
-        layout.addWidget(self.txt_negative)
         
         btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         btns.accepted.connect(self.accept)
@@ -299,18 +338,29 @@ class PromptEditDialog(QDialog):
 class PromptManagerWidget(BaseManagerWidget):
     def __init__(self, directories, app_settings, parent_window=None):
         self.parent_window = parent_window
+        self._structure_path_cache = {} # [Optimization] json_path -> prompt resource folder
         
         # Filter directories for 'prompt' mode
-        prompt_dirs = {k: v for k, v in directories.items() if v.get("mode") == "prompt"}
+        prompt_dirs = filter_directories_by_mode(directories, "prompt")
         super().__init__(prompt_dirs, SUPPORTED_EXTENSIONS["prompt"], app_settings)
         
         self.current_prompt_data = [] # List of dicts
         self.current_json_path = None
         self.current_prompt_index = -1
+        self._prompt_load_gen = 0 # [Optimization] Latest file load; older results are dropped
+        self._selected_item = None # [Optimization] Highlighted row, so selection touches two widgets
+        self._saved_digest = {} # [Optimization] json_path -> digest of the last payload we queued
+        
+        # [Optimization] Prompt files are written by a background writer; a burst of edits
+        # or moves collapses into one write
+        self._json_writer = JsonWriter()
+        self._json_writer.save_failed.connect(self._on_json_save_failed) # Queued onto the UI thread
+        self._json_writer.start()
 
     def set_directories(self, directories):
         # Filter directories for 'prompt' mode
-        prompt_dirs = {k: v for k, v in directories.items() if v.get("mode") == "prompt"}
+        prompt_dirs = filter_directories_by_mode(directories, "prompt")
+        self._structure_path_cache.clear() # Settings (incl. cache_path) change through here
         super().set_directories(prompt_dirs)
         # Update ExampleTab directories too
         if hasattr(self, 'tab_example'):
@@ -319,6 +369,15 @@ class PromptManagerWidget(BaseManagerWidget):
     # [Fix] Override mode
     def get_mode(self): return "prompt"
 
+    def _get_base_cache(self, json_path):
+        # Resource folder for a prompt file: cache/prompt/<stem>. get_cache_dir() stats the
+        # configured cache folder, so resolve once per file instead of on every selection
+        base_cache = self._structure_path_cache.get(json_path)
+        if base_cache is None:
+            base_cache = self._structure_path_cache[json_path] = calculate_structure_path(
+                json_path, self.get_cache_dir(), self.directories, mode=self.get_mode())
+        return base_cache
+
     def init_center_panel(self):
         # List widget for displaying prompts chunks
         self.prompt_list = QListWidget()
@@ -338,6 +397,18 @@ class PromptManagerWidget(BaseManagerWidget):
         
         self.center_layout.addWidget(self.prompt_list)
         
+        # [Optimization] A drag-resize fires many Resize events; re-measure once it pauses
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(30)
+        self._resize_timer.timeout.connect(self._adjust_list_items)
+        self._last_adjust_width = -1 # Width the current rows were measured for
+        
+        # [Optimization] Row widgets are only built once a row scrolls into view
+        scroll_bar = self.prompt_list.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._ensure_visible_widgets)
+        scroll_bar.rangeChanged.connect(self._ensure_visible_widgets) # Viewport grew/shrank
+        
         # [Fix] Install Event Filter for Resizing
         self.prompt_list.installEventFilter(self)
         
@@ -377,22 +448,31 @@ class PromptManagerWidget(BaseManagerWidget):
         self.center_layout.addLayout(btn_layout)
 
     def eventFilter(self, obj, event):
-        if obj == self.prompt_list and event.type() == event.类型.Resize:
-            self._adjust_list_items()
+        if obj is self.prompt_list and event.type() == QEvent.Resize:
+            # Height-only resizes never change wrapping
+            if event.size().width() != event.oldSize().width():
+                self._resize_timer.start()
         
         return super().eventFilter(obj, event)
 
-    def _adjust_list_items(self):
-        """Force update item sizes based on current viewport width to fix word wrap resizing."""
+    def _list_item_width(self):
         # Calculate available width
         width = self.prompt_list.viewport().width()
         # Enforce minimum width to prevent collapse
-        if width < 100: width = 100
+        return max(width, 100)
+
+    def _adjust_list_items(self):
+        """Force update item sizes based on current viewport width to fix word wrap resizing."""
+        width = self._list_item_width()
+        # [Optimization] Rows already measured for this width (rebuilds reset this)
+        if width == self._last_adjust_width: return
+        self._last_adjust_width = width
         
         for i in range(self.prompt_list.count()):
             item = self.prompt_list.item(i)
             widget = self.prompt_list.itemWidget(item)
-            if widget and hasattr(widget, 'calculate_height'):
+            # [Optimization] Rows realized at this width already carry the right hint
+            if isinstance(widget, PromptListItemWidget) and widget.hint_width != width:
                 # 1. Calculate EXACT height needed for this width
                 new_height = widget.calculate_height(width)
                 
@@ -400,7 +480,57 @@ class PromptManagerWidget(BaseManagerWidget):
                 current_hint = item.sizeHint()
                 if current_hint.height() != new_height or current_hint.width() != width:
                     item.setSizeHint(QSize(width, new_height))
+                widget.hint_width = width
+
+    def _ensure_visible_widgets(self, *_):
+        """Builds row widgets for the visible rows (plus a small margin) that don't have one yet."""
+        lst = self.prompt_list
+        count = lst.count()
+        # Scrollbar signals still fire while the list is being cleared/refilled silently
+        if not count or lst.signalsBlocked(): return
+        viewport_h = lst.viewport().height()
+        first = self._row_near(0, 1)
+        last = self._row_near(viewport_h - 1, -1)
+        if first < 0: first = 0 # The layout is still pending after a rebuild
+        # Every row is at least MIN_HEIGHT tall, which bounds how many can be on screen
+        last_bound = first + viewport_h // PromptListItemWidget.MIN_HEIGHT + 1
+        last = last_bound if last < 0 else min(last, last_bound)
+        
+        width = self._list_item_width()
+        # Placeholders use the minimum row height, so realizing rows only pushes later rows down
+        # and the visible range computed above never needs to grow
+        entries = len(self.current_prompt_data)
+        for row in range(max(0, first - 5), min(count, last + 6)):
+            item = lst.item(row)
+            # [Fix] Skip rows not backed by an entry (error rows, or a clear() still in progress)
+            idx = item.data(Qt.UserRole)
+            if idx is None or idx >= entries: continue
+            if lst.itemWidget(item) is None:
+                self._create_item_widget(item, width)
 
+    def _row_near(self, y, direction):
+        """Row at viewport height `y`, stepping over the spacing gap between rows if `y` falls in one."""
+        lst = self.prompt_list
+        gap = 2 * lst.spacing() + 1
+        x = lst.spacing() + 1 # Rows are inset by the spacing
+        row = lst.indexAt(QPoint(x, y)).row()
+        if row < 0:
+            row = lst.indexAt(QPoint(x, y + direction * gap)).row()
+        return row
+
+    def _create_item_widget(self, item, width):
+        entry = self.current_prompt_data[item.data(Qt.UserRole)]
+        widget = PromptListItemWidget(entry.get("positive", ""), entry.get("negative", ""), entry.get("tags", []))
+        widget.copy_requested.connect(self._on_copy_requested)
+        
+        # Connect clicked signal to select this item (O(1); the item is bound here)
+        widget.clicked.connect(lambda item=item: self.prompt_list.setCurrentItem(item))
+        widget.set_selected(item.isSelected())
+        
+        # Assign widget to item
+        item.setSizeHint(QSize(width, widget.calculate_height(width)))
+        widget.hint_width = width
+        self.prompt_list.setItemWidget(item, widget)
         
     def init_left_bottom(self, layout):
         # Container for buttons
@@ -466,7 +596,7 @@ class PromptManagerWidget(BaseManagerWidget):
         
         # Select File
         filters = "Media (*.png *.jpg *.jpeg *.webp *.mp4 *.webm *.gif)"
-        file_path, _ = QFileDialog.getOpenFile名称(self, f"Select {mtype.title()}", "", filters)
+        file_path, _ = QFileDialog.getOpenFileName(self, f"Select {mtype.title()}", "", filters)
         if not file_path: return None
         
         # Calculate target relative path: <json_stem>/<UUID>/assets
@@ -497,17 +627,71 @@ class PromptManagerWidget(BaseManagerWidget):
             self._load_prompt_content(path)
             
     def _load_prompt_content(self, path):
-        self.current_json_path = path
+        self._clear_prompt_list()
+        # Nothing is editable until the file arrives, so an early edit can't overwrite it
+        self.current_json_path = None
+        self._saved_digest.pop(path, None) # The file may have changed outside the app
         self.current_prompt_data = []
-        self.prompt_list.clear()
         self.tab_note.set_text("")
         self.tab_example.unload_current_examples()
         self.current_prompt_index = -1
         
+        # [Optimization] Read + parse on the thread pool; only the newest request is applied
+        self._prompt_load_gen += 1
+        # A save that hasn't reached the disk yet is newer than the file
+        loader = PromptFileLoader(path, self._prompt_load_gen, self._json_writer.latest_document(path))
+        loader.signals.loaded.connect(self._on_prompt_file_loaded)
+        loader.signals.failed.connect(self._on_prompt_file_failed)
+        QThreadPool.globalInstance().start(loader)
+
+    def _set_highlighted_item(self, item):
+        # [Optimization] Only the previous and the new row change state. Rows realized later
+        # pick up their state from item.isSelected() in _create_item_widget.
+        for it, selected in ((self._selected_item, False), (item, True)):
+            if it is None: continue
+            widget = self.prompt_list.itemWidget(it)
+            if isinstance(widget, PromptListItemWidget):
+                widget.set_selected(selected)
+        self._selected_item = item
+
+    def _clear_prompt_list(self):
+        # [Fix] clear() removes rows one at a time and re-emits itemSelectionChanged for a
+        # selected row on each removal; deselect once, then clear silently
+        self.prompt_list.clearSelection()
+        self.prompt_list.blockSignals(True)
+        try:
+            self.prompt_list.clear()
+        finally:
+            self.prompt_list.blockSignals(False)
+        self._selected_item = None
+
+    def _add_message_row(self, text):
+        # [Fix] Status rows carry no entry index, so they must not be selectable
+        item = QListWidgetItem(text)
+        item.setFlags(Qt.NoItemFlags)
+        self.prompt_list.addItem(item)
+
+    def _on_prompt_file_failed(self, generation, path, error):
+        if generation != self._prompt_load_gen: return # Superseded by a newer selection
+        self.current_json_path = path
+        logging.error(f"错误 loading prompt JSON: {error}")
+        self._add_message_row(f"错误 loading file: {error}")
+        self.show_status_message(f"错误 loading file: {error}")
+
+    def _on_prompt_file_loaded(self, generation, path, data, size):
+        if generation != self._prompt_load_gen: return # Superseded by a newer selection
+        
+        # [Optimization] Oversized files are not parsed (and so never rewritten) on a single click.
+        # current_json_path stays None so edits can't overwrite it with an empty list.
+        if data is None:
+            msg = f"File too large ({self.format_size(size)}), open it externally"
+            logging.warning(f"Skipping large prompt file: {path} ({size} bytes)")
+            self._add_message_row(msg)
+            self.show_status_message(msg)
+            return
+        
+        self.current_json_path = path
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
             if isinstance(data, list):
                 self.current_prompt_data = data
             elif isinstance(data, dict):
@@ -534,10 +718,11 @@ class PromptManagerWidget(BaseManagerWidget):
 
             # [Migration] Check for missing IDs and Migrate Folders
             dirty = False
-            base_cache_path = calculate_structure_path(path, self.get_cache_dir(), self.directories, mode=self.get_mode())
+            base_cache_path = self._get_base_cache(path)
             # base_cache_path is roughly: cache/prompt/<json_filename>
             
             migrated_count = 0
+            existing = None # [Optimization] Folder names under base_cache_path, listed once
             
             for idx, entry in enumerate(self.current_prompt_data):
                 if "id" not in entry:
@@ -545,11 +730,18 @@ class PromptManagerWidget(BaseManagerWidget):
                     entry["id"] = uid
                     dirty = True
                     
+                    if existing is None:
+                        try:
+                            with os.scandir(base_cache_path) as it:
+                                existing = {e.name for e in it}
+                        except OSError:
+                            existing = set() # No resource folder yet
+                    
                     # Migration Logic: Check if legacy folder exists for this index
                     legacy_path = os.path.join(base_cache_path, str(idx))
                     new_path = os.path.join(base_cache_path, uid)
                     
-                    if os.path.exists(legacy_path) and not os.path.exists(new_path):
+                    if str(idx) in existing and uid not in existing:
                         try:
                             # Ensure parent existence not strictly needed as legacy exists
                             os.rename(legacy_path, new_path)
@@ -571,26 +763,25 @@ class PromptManagerWidget(BaseManagerWidget):
             if self.prompt_list.count() > 0:
                 self.prompt_list.setCurrentRow(0)
             
-            size = os.path.getsize(path)
             self.show_status_message(f"Loaded: {os.path.basename(path)} ({self.format_size(size)})")
             
         except Exception as e:
             logging.error(f"错误 loading prompt JSON: {e}")
-            self.prompt_list.addItem(f"错误 loading file: {e}")
+            self._add_message_row(f"错误 loading file: {e}")
             self.show_status_message(f"错误 loading file: {e}")
 
     def on_prompt_selected(self):
         selected_items = self.prompt_list.selectedItems()
+        # Rows without an entry index (status messages) count as no selection
+        if selected_items and selected_items[0].data(Qt.UserRole) is None:
+            selected_items = []
         if not selected_items:
             self.current_prompt_index = -1
             self.tab_note.set_text("")
             self.tab_example.unload_current_examples()
             
-            # Clear all highlights
-            for i in range(self.prompt_list.count()):
-                widget = self.prompt_list.itemWidget(self.prompt_list.item(i))
-                if widget and isinstance(widget, PromptListItemWidget):
-                    widget.set_selected(False)
+            # Clear highlight
+            self._set_highlighted_item(None)
             return
 
         item = selected_items[0]
@@ -598,13 +789,7 @@ class PromptManagerWidget(BaseManagerWidget):
         self.current_prompt_index = idx
         
         # [Visual Fix] Update Highlight State
-        # Loop all items to clear others and enable current
-        # This is okay for small lists, but if slow, track previous selected widget.
-        for i in range(self.prompt_list.count()):
-            it = self.prompt_list.item(i)
-            widget = self.prompt_list.itemWidget(it)
-            if widget and isinstance(widget, PromptListItemWidget):
-                widget.set_selected(it == item)
+        self._set_highlighted_item(item)
 
         if 0 <= idx < len(self.current_prompt_data):
             entry = self.current_prompt_data[idx]
@@ -617,7 +802,7 @@ class PromptManagerWidget(BaseManagerWidget):
             if item_id:
                 # Calculate resource path
                 # cache/prompt/<stem>/<UUID>
-                base_cache = calculate_structure_path(self.current_json_path, self.get_cache_dir(), self.directories, mode=self.get_mode())
+                base_cache = self._get_base_cache(self.current_json_path)
                 custom_path = os.path.join(base_cache, item_id)
                 
                 self.tab_example.load_examples(self.current_json_path, custom_cache_path=custom_path)
@@ -666,8 +851,8 @@ class PromptManagerWidget(BaseManagerWidget):
             
         # Create empty JSON list
         try:
-            with open(full_path, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=2)
+            with open(full_path, 'wb') as f:
+                f.write(json_dumps_bytes([], pretty=True))
             
             self.show_status_message(f"Created: {filename}")
             
@@ -695,7 +880,8 @@ class PromptManagerWidget(BaseManagerWidget):
         
         self.current_prompt_data.append(new_item)
         self._save_current_data()
-        self.refresh_current_file()
+        # [Optimization] Append one row instead of rebuilding the whole list
+        self._append_row(len(self.current_prompt_data) - 1)
         
         # Select the new item
         count = self.prompt_list.count()
@@ -714,9 +900,11 @@ class PromptManagerWidget(BaseManagerWidget):
             item_data["positive"] = pos
             item_data["negative"] = neg
             self._save_current_data()
-            self.refresh_current_file()
-            # Restore selection
-            self.prompt_list.setCurrentRow(self.current_prompt_index)
+            # [Optimization] Only the edited row changes; the selection stays as it is
+            idx = self.current_prompt_index
+            self._rebuild_row_widgets(idx)
+            if self.current_prompt_index != idx: # A full rebuild reset the selection
+                self.prompt_list.setCurrentRow(idx)
 
     def move_item_up(self):
         idx = self.current_prompt_index
@@ -726,7 +914,7 @@ class PromptManagerWidget(BaseManagerWidget):
         self.current_prompt_data[idx], self.current_prompt_data[idx-1] = self.current_prompt_data[idx-1], self.current_prompt_data[idx]
         
         self._save_current_data()
-        self.refresh_current_file()
+        self._rebuild_row_widgets(idx, idx-1)
         self.prompt_list.setCurrentRow(idx-1)
 
     def move_item_down(self):
@@ -737,7 +925,7 @@ class PromptManagerWidget(BaseManagerWidget):
         self.current_prompt_data[idx], self.current_prompt_data[idx+1] = self.current_prompt_data[idx+1], self.current_prompt_data[idx]
         
         self._save_current_data()
-        self.refresh_current_file()
+        self._rebuild_row_widgets(idx, idx+1)
         self.prompt_list.setCurrentRow(idx+1)
 
     def remove_prompt_item(self):
@@ -759,7 +947,7 @@ class PromptManagerWidget(BaseManagerWidget):
         try:
             item_id = item_data.get("id")
             if item_id and self.current_json_path:
-                 base_cache = calculate_structure_path(self.current_json_path, self.get_cache_dir(), self.directories, mode=self.get_mode())
+                 base_cache = self._get_base_cache(self.current_json_path)
                  # Folder to delete: cache/prompt/<json>/<UUID>
                  target_dir = os.path.join(base_cache, item_id)
                  
@@ -772,47 +960,104 @@ class PromptManagerWidget(BaseManagerWidget):
             QMessageBox.warning(self, "Warning", f"失败 to delete resource folder:\\n{e}")
 
         # Delete from list
-        del self.current_prompt_data[self.current_prompt_index]
+        idx = self.current_prompt_index
+        del self.current_prompt_data[idx]
         self._save_current_data()
-        self.refresh_current_file()
+        self._remove_row(idx)
 
     def _save_current_data(self):
-        if not self.current_json_path: return
+        if not self.current_json_path: return False
+        # Serialize now so later edits to the in-memory list can't leak into this save
         try:
-            with open(self.current_json_path, 'w', encoding='utf-8') as f:
-                json.dump(self.current_prompt_data, f, indent=2, ensure_ascii=False)
+            payload = json_dumps_bytes(self.current_prompt_data, pretty=True)
         except Exception as e:
             QMessageBox.critical(self, "错误", f"失败 to save JSON: {e}")
+            return False
+        # [Optimization] Same bytes as the last save (e.g. an edit with no changes): nothing to write
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if self._saved_digest.get(self.current_json_path) == digest:
+            return True
+        self._saved_digest[self.current_json_path] = digest
+        self._json_writer.submit_document(self.current_json_path, payload)
+        return True
+
+    def _on_json_save_failed(self, json_path, error):
+        # [Fix] The digest is recorded at queue time; forget it so saving the same content retries
+        self._saved_digest.pop(json_path, None)
+        QMessageBox.critical(self, "错误", f"失败 to save JSON: {os.path.basename(json_path)}: {error}")
 
     def refresh_current_file(self):
         if self.current_json_path:
-            # Reload from list memory
-            self.prompt_list.clear() # Single clear is enough
-            
-            for idx, entry in enumerate(self.current_prompt_data):
-                pos = entry.get("positive", "")
-                neg = entry.get("negative", "")
-                tags = entry.get("tags", [])
+            # [Optimization] Repaint once after repopulating instead of per inserted row
+            self.prompt_list.setUpdatesEnabled(False)
+            try:
+                # Reload from list memory
+                self._clear_prompt_list() # Single clear is enough
                 
-                item = QListWidgetItem()
-                item.setData(Qt.UserRole, idx)
-                self.prompt_list.addItem(item)
-                
-                # Create and set custom widget
-                widget = PromptListItemWidget(pos, neg, tags)
-                widget.copy_requested.connect(self._on_copy_requested)
-                
-                # Connect clicked signal to select this item
-                widget.clicked.connect(lambda item=item: self.prompt_list.setCurrentItem(item))
-                
-                # Assign widget to item
-                item.setSizeHint(widget.sizeHint())
-                self.prompt_list.setItemWidget(item, widget)
+                # [Optimization] Lightweight placeholder rows; _ensure_visible_widgets builds the
+                # (two text edits + label) widgets only for rows that are actually on screen
+                width = self._list_item_width()
+                placeholder = QSize(width, PromptListItemWidget.MIN_HEIGHT)
+                self.prompt_list.blockSignals(True)
+                try:
+                    for idx in range(len(self.current_prompt_data)):
+                        item = QListWidgetItem()
+                        item.setData(Qt.UserRole, idx)
+                        item.setSizeHint(placeholder)
+                        self.prompt_list.addItem(item)
+                finally:
+                    self.prompt_list.blockSignals(False)
+                self._ensure_visible_widgets()
+            finally:
+                self.prompt_list.setUpdatesEnabled(True)
+            
+            # New rows need measuring for the current width
+            self._last_adjust_width = -1
+            self._resize_timer.start()
 
 
 
-    def eventFilter(self, obj, event):
-        return super().eventFilter(obj, event)
+    # [Optimization] Incremental list mutations: rows map to current_prompt_data by position
+    # (Qt.UserRole), so add/edit/move/remove only touch the affected rows instead of
+    # rebuilding every item via refresh_current_file
+    def _rows_out_of_sync(self, expected_rows):
+        # [Fix] A message row (load error) breaks row == entry index; rebuild from the data instead
+        if self.prompt_list.count() == expected_rows:
+            return False
+        self.refresh_current_file()
+        return True
+
+    def _append_row(self, idx):
+        if self._rows_out_of_sync(idx): return # The rebuild already includes the new entry
+        item = QListWidgetItem()
+        item.setData(Qt.UserRole, idx)
+        item.setSizeHint(QSize(self._list_item_width(), PromptListItemWidget.MIN_HEIGHT))
+        self.prompt_list.addItem(item)
+        self._ensure_visible_widgets()
+
+    def _rebuild_row_widgets(self, *rows):
+        # Rows without a widget yet are built from the updated data once they scroll into view
+        if self._rows_out_of_sync(len(self.current_prompt_data)): return
+        width = self._list_item_width()
+        for row in rows:
+            item = self.prompt_list.item(row)
+            if item is not None and self.prompt_list.itemWidget(item) is not None:
+                self._create_item_widget(item, width)
+
+    def _remove_row(self, idx):
+        # Same outcome as a rebuild: nothing stays selected and the detail panel is reset
+        if self._rows_out_of_sync(len(self.current_prompt_data) + 1): return
+        self.prompt_list.clearSelection()
+        # takeItem would select the next row while its index is still stale
+        self.prompt_list.blockSignals(True)
+        try:
+            self.prompt_list.takeItem(idx)
+            self.prompt_list.clearSelection()
+        finally:
+            self.prompt_list.blockSignals(False)
+        for row in range(idx, self.prompt_list.count()):
+            self.prompt_list.item(row).setData(Qt.UserRole, row)
+        self._ensure_visible_widgets()
 
     def _on_copy_requested(self, text, ptype):
         if text:
@@ -830,12 +1075,7 @@ class PromptManagerWidget(BaseManagerWidget):
         self.current_prompt_data[self.current_prompt_index]["note"] = text
         
         # Save to file
-        try:
-            with open(self.current_json_path, 'w', encoding='utf-8') as f:
-                json.dump(self.current_prompt_data, f, indent=2, ensure_ascii=False)
+        if self._save_current_data():
             self.show_status_message("Prompt note saved.")
-        except Exception as e:
-            logging.error(f"失败 to save prompt json: {e}")
-            self.show_status_message(f"Save failed: {e}")
 
 
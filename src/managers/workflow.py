@@ -15,30 +15,25 @@ from .base import BaseManagerWidget
 import base64
 from ..core import (
     SUPPORTED_EXTENSIONS, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, 
-    HAS_MARKDOWN, calculate_structure_path, PREVIEW_EXTENSIONS
+    HAS_MARKDOWN, calculate_structure_path, filter_directories_by_mode, PREVIEW_EXTENSIONS
 )
 from ..ui_components import SmartMediaWidget, ZoomWindow, TaskMonitorWidget
 from ..ui.workflow_viewer import WorkflowGraphViewer
 from .example import ExampleTabWidget
 from ..workers import ImageLoader
 
-try:
-    import markdown
-except ImportError:
-    pass
-
 class WorkflowManagerWidget(BaseManagerWidget):
     def __init__(self, directories, app_settings, task_monitor, parent_window=None):
         self.task_monitor = task_monitor
         self.parent_window = parent_window
         
         # Filter directories for 'workflow' mode
-        wf_dirs = {k: v for k, v in directories.items() if v.get("mode") == "workflow"}
+        wf_dirs = filter_directories_by_mode(directories, "workflow")
         super().__init__(wf_dirs, SUPPORTED_EXTENSIONS["workflow"], app_settings)
 
     def set_directories(self, directories):
         # Filter directories for 'workflow' mode
-        wf_dirs = {k: v for k, v in directories.items() if v.get("mode") == "workflow"}
+        wf_dirs = filter_directories_by_mode(directories, "workflow")
         super().set_directories(wf_dirs)
         if hasattr(self, 'tab_example'):
             self.tab_example.directories = directories
@@ -98,18 +93,19 @@ class WorkflowManagerWidget(BaseManagerWidget):
 
         self.right_layout.addWidget(self.tabs)
 
-    def on_tree_select(self):
+    def _do_tree_select(self):
         item = self.tree.currentItem()
         if not item: return
         
-        # [Memory] Fast cleanup
-        self.preview_lbl.clear_memory()
-        if hasattr(self, 'tab_example'):
-             self.tab_example.unload_current_examples()
-             
         path = item.data(0, Qt.UserRole)
         type_ = item.data(0, Qt.UserRole + 1)
         
+        # [Memory] Fast cleanup when leaving files; file -> file is replaced in place by _load_details
+        if type_ != "file":
+            self.preview_lbl.clear_memory()
+            if hasattr(self, 'tab_example'):
+                 self.tab_example.unload_current_examples()
+        
         if type_ == "file" and path:
             self.current_path = path
             self._load_details(path)
@@ -125,12 +121,18 @@ class WorkflowManagerWidget(BaseManagerWidget):
         super().closeEvent(event)
     def _load_details(self, path):
         # [Refactor] Use shared logic from BaseManagerWidget
-        filename, size_str, date_str, preview_path = self._load_common_file_details(path)
+        filename, _ext, size_str, date_str, preview_path = self._load_common_file_details(path)
         
-        self.info_labels["名称"].setText(filename)
-        self.info_labels["大小"].setText(size_str)
-        self.info_labels["日期"].setText(date_str)
-        self.info_labels["路径"].setText(path)
+        # [Optimization] One relayout for the whole panel instead of one per label
+        panel = self.info_labels["名称"].parentWidget()
+        panel.setUpdatesEnabled(False)
+        try:
+            self.info_labels["名称"].setText(filename)
+            self.info_labels["大小"].setText(size_str)
+            self.info_labels["日期"].setText(date_str)
+            self.info_labels["路径"].setText(path)
+        finally:
+            panel.setUpdatesEnabled(True)
         
         self.preview_lbl.set_media(preview_path)
         
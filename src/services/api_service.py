@@ -1,4 +1,3 @@
-import re
 import logging
 from ..utils.network import NetworkClient
 
@@ -11,13 +10,21 @@ class ApiService:
         self.client = NetworkClient(civitai_key, hf_key)
 
     def fetch_civitai_version(self, file_hash):
+        return self.lookup_civitai_version(file_hash)[0]
+
+    def lookup_civitai_version(self, file_hash):
+        """
+        Returns (version_data, not_found). not_found is True only for a definite 404, so a
+        network or server error can be told apart from a hash Civitai doesn't know.
+        """
         try:
             resp = self.client.get(f"https://civitai.com/api/v1/model-versions/by-hash/{file_hash}")
             if resp.status_code == 200:
-                return resp.json()
+                return resp.json(), False
+            return {}, resp.status_code == 404
         except Exception as e:
             logging.error(f"[ApiService] fetch_civitai_version error: {e}")
-        return {}
+        return {}, False
 
     def fetch_civitai_model(self, model_id):
         try:
@@ -1,9 +1,34 @@
 import os
 import hashlib
-import json
 import logging
 import shutil
-from ..core import calculate_structure_path, PREVIEW_EXTENSIONS, CACHE_DIR_NAME
+from ..core import calculate_structure_path, PREVIEW_EXTENSIONS, CACHE_DIR_NAME, json_loads_bytes, json_dumps_bytes, write_bytes_atomic
+
+# [Optimization] Page-cache hints are Linux/BSD only
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+# [Optimization] Optional BLAKE3 (SIMD + multithreaded); Civitai's by-hash lookup accepts it too
+try:
+    import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
+
+BLAKE3_THREADED_MIN_BYTES = 128 * 1024 # Below this, thread startup costs more than it saves
+
+def _open_with_advise(path):
+    """Opens `path` for a one-pass sequential read, hinting the kernel where supported."""
+    f = open(path, "rb")
+    if HAS_FADVISE:
+        try: os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError: pass
+    return f
+
+def _drop_from_page_cache(f):
+    """Lets the kernel evict pages of a large file we will not read again."""
+    if HAS_FADVISE:
+        try: os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError: pass
 
 class FileService:
     """
@@ -18,42 +43,101 @@ class FileService:
         stop_event: Object with .is_app_running() or similar method/flag if needed, 
                     or simply a callable that returns bool.
         """
-        sha256 = hashlib.sha256()
         try:
-            with open(path, "rb") as f:
-                for chunk in iter(lambda: f.read(1048576), b""):
-                    if stop_event and stop_event(): return ""
-                    sha256.update(chunk)
-            return sha256.hexdigest().upper()
+            with _open_with_advise(path) as f:
+                try:
+                    if stop_event is None:
+                        # [Optimization] file_digest reads into one reused buffer instead of
+                        # allocating a bytes object per chunk; each update() releases the GIL
+                        # while OpenSSL hashes (with SHA-NI where the CPU has it)
+                        return hashlib.file_digest(f, "sha256").hexdigest().upper()
+
+                    # Cancellable path: chunked so stop_event can be polled.
+                    # [Memory] One reused buffer instead of a fresh 4 MiB bytes object per read
+                    sha256 = hashlib.sha256()
+                    buf = bytearray(4194304)
+                    view = memoryview(buf)
+                    while n := f.readinto(buf):
+                        if stop_event(): return ""
+                        sha256.update(view[:n])
+                    return sha256.hexdigest().upper()
+                finally:
+                    # Model bodies are read once; keep the page cache for previews
+                    _drop_from_page_cache(f)
         except OSError as e:
             logging.error(f"[FileService] 哈希 calculation error: {e}")
             return ""
 
-    def get_cached_hash(self, model_path, directories, cache_mode="model", status_signal=None):
+    def calculate_blake3_and_sha256(self, path, stop_event=None):
         """
-        Returns (hash, is_cached_bool).
-        Manages the .json cache sidecard in the cache structure.
+        Calculates (BLAKE3, SHA256) of a file in a single read, feeding each chunk to both
+        hashers, so a lookup that misses on BLAKE3 never has to read the file a second time.
+        stop_event: optional callable; returning True abandons the read with ("", "").
         """
+        try:
+            with _open_with_advise(path) as f:
+                try:
+                    size = os.fstat(f.fileno()).st_size
+                    threads = blake3.blake3.AUTO if size >= BLAKE3_THREADED_MIN_BYTES else 1
+                    b3 = blake3.blake3(max_threads=threads)
+                    sha256 = hashlib.sha256()
+                    buf = bytearray(4194304)
+                    view = memoryview(buf)
+                    while n := f.readinto(buf):
+                        if stop_event and stop_event(): return "", ""
+                        chunk = view[:n]
+                        b3.update(chunk)
+                        sha256.update(chunk)
+                    return b3.hexdigest().upper(), sha256.hexdigest().upper()
+                finally:
+                    _drop_from_page_cache(f)
+        except (OSError, ValueError) as e:
+            logging.error(f"[FileService] 哈希 calculation error: {e}")
+            return "", ""
+
+    @staticmethod
+    def _file_stat(model_path):
+        """(mtime, size) identifying one version of a file; None if it is gone."""
+        try:
+            st = os.stat(model_path)
+        except OSError: return None
+        return st.st_mtime, st.st_size
+
+    @staticmethod
+    def _hash_cache_valid(data, file_stat):
+        # Sidecars written before size_check existed are validated on mtime alone
+        mtime, size = file_stat
+        return data.get("mtime_check") == mtime and data.get("size_check", size) == size
+
+    def _hash_cache_state(self, model_path, directories, cache_mode):
+        """Returns (json_path, file_stat, cached digests by algorithm) for a model file."""
         cache_dir = calculate_structure_path(model_path, self.cache_root, directories, mode=cache_mode)
-        if not os.path.exists(cache_dir): os.makedirs(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
         
         model_name = os.path.splitext(os.path.basename(model_path))[0]
         json_path = os.path.join(cache_dir, model_name + ".json")
         
+        # [Optimization] One stat decides whether a multi-GB re-hash can be skipped
+        file_stat = self._file_stat(model_path)
+        if file_stat is None: return json_path, None, {}
+
+        cached = {}
         try:
-            file_mtime = os.path.getmtime(model_path)
-        except OSError: return None, False
+            with open(json_path, 'rb') as f:
+                data = json_loads_bytes(f.read())
+            if isinstance(data, dict) and self._hash_cache_valid(data, file_stat):
+                cached = {algo: data[algo] for algo in ("sha256", "blake3") if data.get(algo)}
+        except (OSError, ValueError): pass # Missing or unreadable sidecar: hash again
+        return json_path, file_stat, cached
 
-        # Read Cache
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    cached_hash = data.get("sha256")
-                    cached_mtime = data.get("mtime_check")
-                    if cached_hash and cached_mtime == file_mtime:
-                        return cached_hash, True
-            except (OSError, json.JSONDecode错误): pass
+    def get_cached_hash(self, model_path, directories, cache_mode="model", status_signal=None):
+        """
+        Returns (hash, is_cached_bool).
+        Manages the .json cache sidecard in the cache structure.
+        """
+        json_path, file_stat, cached = self._hash_cache_state(model_path, directories, cache_mode)
+        if file_stat is None: return None, False
+        if "sha256" in cached: return cached["sha256"], True
 
         # Calculate
         if status_signal: status_signal.emit("Calculating SHA256 (First run)...")
@@ -61,24 +145,68 @@ class FileService:
         calculated_hash = self.calculate_sha256(model_path)
         if not calculated_hash: return None, False
 
-        # Write Cache
+        self._write_hash_cache(json_path, {"sha256": calculated_hash}, file_stat)
+        return calculated_hash, False
+
+    def iter_lookup_hashes(self, model_path, directories, cache_mode="model", status_signal=None, stop_event=None):
+        """
+        Yields (hash, is_cached_bool) candidates for a Civitai by-hash lookup.
+        A cached SHA256 is authoritative and yielded alone. Otherwise BLAKE3 comes first and
+        SHA256 is the fallback for a caller that asks again after a miss. When nothing is cached
+        and the blake3 package is installed, both digests come from one read of the file.
+        stop_event is polled between chunks so a stopped worker does not finish a multi-GB hash.
+        """
+        json_path, file_stat, cached = self._hash_cache_state(model_path, directories, cache_mode)
+        if file_stat is None: return
+        if "sha256" in cached:
+            yield cached["sha256"], True
+            return
+
+        if "blake3" in cached:
+            yield cached["blake3"], True
+        elif HAS_BLAKE3:
+            if status_signal: status_signal.emit("Calculating BLAKE3 + SHA256 (First run)...")
+            b3_digest, sha_digest = self.calculate_blake3_and_sha256(model_path, stop_event=stop_event)
+            if not b3_digest: return
+            self._write_hash_cache(json_path, {"blake3": b3_digest, "sha256": sha_digest}, file_stat)
+            yield b3_digest, False
+            yield sha_digest, False
+            return
+
+        if status_signal: status_signal.emit("Calculating SHA256 (First run)...")
+        digest = self.calculate_sha256(model_path, stop_event=stop_event)
+        if not digest: return
+        self._write_hash_cache(json_path, {"sha256": digest}, file_stat)
+        yield digest, False
+
+    def store_hash(self, model_path, sha256, directories, cache_mode="model"):
+        """Seeds the hash cache with a digest computed elsewhere (e.g. while downloading)."""
+        file_stat = self._file_stat(model_path)
+        if file_stat is None: return
+        cache_dir = calculate_structure_path(model_path, self.cache_root, directories, mode=cache_mode)
+        os.makedirs(cache_dir, exist_ok=True)
+        model_name = os.path.splitext(os.path.basename(model_path))[0]
+        self._write_hash_cache(os.path.join(cache_dir, model_name + ".json"), {"sha256": sha256}, file_stat)
+
+    def _write_hash_cache(self, json_path, digests, file_stat):
+        """Stores {algorithm: digest} for the file version identified by `file_stat`."""
         try:
             new_data = {}
-            if os.path.exists(json_path):
-                try:
-                    with open(json_path, 'r', encoding='utf-8') as f: new_data = json.load(f)
-                except Exception: pass
-            
-            new_data["sha256"] = calculated_hash
-            new_data["mtime_check"] = file_mtime
+            try:
+                with open(json_path, 'rb') as f: new_data = json_loads_bytes(f.read())
+            except (OSError, ValueError): pass
+            if not isinstance(new_data, dict): new_data = {} # Not a sidecar we wrote: replace it
             
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(new_data, f, indent=4, ensure_ascii=False)
+            if not self._hash_cache_valid(new_data, file_stat):
+                # Digests of an older version of the file must not survive next to the new one
+                new_data.pop("sha256", None)
+                new_data.pop("blake3", None)
+            new_data.update(digests)
+            new_data["mtime_check"], new_data["size_check"] = file_stat
+            write_bytes_atomic(json_path, json_dumps_bytes(new_data))
         except Exception as e:
             logging.warning(f"[FileService] 失败 to save hash cache: {e}")
 
-        return calculated_hash, False
-
     def check_metadata_exists(self, model_path, directories, cache_mode="model"):
         """Checks if metadata json or preview exists in cache."""
         cache_dir = calculate_structure_path(model_path, self.cache_root, directories, mode=cache_mode)
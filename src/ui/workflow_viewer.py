@@ -1,5 +1,6 @@
 import json
 import logging
+from collections import deque
 from typing import Dict, Any, List
 
 from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QGraphicsPathItem, QPushButton
@@ -567,14 +568,14 @@ class WorkflowGraphViewer(QGraphicsView):
 
         # 4. Auto Layout (Simple Level-based)
         # Topological Sort with Levels
-        queue = [nid for nid in in_degree if in_degree[nid] == 0]
+        queue = deque(nid for nid in in_degree if in_degree[nid] == 0)
         levels = {} # nid -> level
         for q in queue: levels[q] = 0
         
         sorted_nodes = []
         
         while queue:
-            u = queue.pop(0)
+            u = queue.popleft()
             sorted_nodes.append(u)
             lvl = levels[u]
             
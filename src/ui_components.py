@@ -1,5 +1,4 @@
 import os
-import gc
 import logging
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QStackedWidget, 
@@ -99,7 +98,7 @@ class SmartMediaWidget(QWidget):
         """
         if self.media_player or self.video_widget:
             generated_logger = logging.getLogger("ui_components")
-            generated_logger.debug(f"[SmartMediaWidget] Release resources for: {self.current_path}")
+            generated_logger.debug("[SmartMediaWidget] Release resources for: %s", self.current_path)
 
         self._destroy_video_components()
         self._stop_movie()
@@ -135,7 +134,7 @@ class SmartMediaWidget(QWidget):
         self.current_path = path # Update current_path here
 
         if not os.path.exists(path):
-            self._destroy_video_components()
+            self._stop_video_playback() # Keep the player around for the next video
             self.is_video = False
             self.stack.setCurrentWidget(self.lbl_image)
             self.lbl_image.setText("无媒体")
@@ -148,6 +147,14 @@ class SmartMediaWidget(QWidget):
             if not self.media_player:
                 self._init_video_components()
             
+            # [Optimization] Same clip reselected: keep the decoded stream instead of reopening it
+            source = QUrl.fromLocalFile(path)
+            if self.is_video and self.media_player.source() == source:
+                self.stack.setCurrentWidget(self.video_widget)
+                if self.media_player.playbackState() != QMediaPlayer.PlayingState:
+                    self.media_player.play()
+                return
+            
             # Stop previous if any
             if self.media_player and self.media_player.playbackState() == QMediaPlayer.PlayingState:
                 self.media_player.stop()
@@ -157,7 +164,7 @@ class SmartMediaWidget(QWidget):
             self.is_video = True
             self.stack.setCurrentWidget(self.video_widget)
             
-            self.media_player.setSource(QUrl.fromLocalFile(path))
+            self.media_player.setSource(source)
             self.media_player.play()
             # The play_timer is no longer strictly needed for initial playback
             # as setSource and play are called directly.
@@ -187,7 +194,7 @@ class SmartMediaWidget(QWidget):
             self.stack.setCurrentWidget(self.lbl_image)
             self.lbl_image.setText("加载中...")
             if self.loader:
-                self.loader.load_image(path, target_width)
+                self.loader.load_image(path, target_width, requester=self)
             else:
                 self._load_image_sync(path, target_width)
 
@@ -256,7 +263,8 @@ class SmartMediaWidget(QWidget):
         self.lbl_image.clear()
         self.play_timer.stop()
         self._destroy_video_components() 
-        gc.collect() # Optional but helpful for large media 
+        # [Memory] No forced gc.collect() here: this runs on every selection and
+        # refcounting already frees the pixmap; owners schedule an idle collect.
 
     def _start_video_playback(self):
         if self.current_path and self.is_video and os.path.exists(self.current_path):
@@ -271,12 +279,15 @@ class SmartMediaWidget(QWidget):
     def _load_image_sync(self, path, target_width=1024):
         # Synchrnous loading using QImageReader
         try:
-            if not os.path.exists(path):
+            # [Optimization] One stat covers both the existence and the size check
+            try:
+                f_size = os.stat(path).st_size
+            except OSError:
                 self.lbl_image.setText("文件未找到")
                 return
 
             # [Safety] Prevent freezing on large files
-            if os.path.getsize(path) > MAX_FILE_LOAD_BYTES:
+            if f_size > MAX_FILE_LOAD_BYTES:
                 self.lbl_image.setText("文件太大")
                 return
 
@@ -1022,6 +1033,34 @@ class SettingsDialog(QDialog):
 # ==========================================
 # New Shared Components
 # ==========================================
+_NOTE_CSS = "<style>img { max-width: 100%; height: auto; } body { color: black; background-color: white; font-family: sans-serif; }</style>"
+_markdown_renderer = None
+
+def _get_markdown_renderer():
+    """
+    Builds the note renderer on first use (False if none is installed).
+    [Optimization] mistune when available; otherwise one reused python-markdown
+    instance instead of rebuilding its extension chain per markdown.markdown() call.
+    """
+    global _markdown_renderer
+    if _markdown_renderer is None:
+        try:
+            import mistune
+            _markdown_renderer = mistune.create_markdown(escape=False, plugins=['strikethrough', 'table'])
+        except (ImportError, AttributeError): # AttributeError: mistune < 2 has no create_markdown
+            try:
+                import markdown
+                md = markdown.Markdown()
+                def render(text):
+                    try:
+                        return md.convert(text)
+                    finally:
+                        md.reset()
+                _markdown_renderer = render
+            except ImportError:
+                _markdown_renderer = False
+    return _markdown_renderer
+
 class MarkdownNoteWidget(QWidget):
     save_requested = Signal(str)
 
@@ -1030,6 +1069,7 @@ class MarkdownNoteWidget(QWidget):
         
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(5,5,5,5)
+        self._rendered_text = None # Markdown source currently shown in the browser
         
         # Stacked Widget to switch between View and Edit modes
         self.stack = QStackedWidget()
@@ -1092,20 +1132,21 @@ class MarkdownNoteWidget(QWidget):
         self.layout.addWidget(self.stack)
 
     def set_text(self, text):
-        self.editor.setText(text)
+        # [Fix] Notes are markdown source; setText would sniff (and swallow) leading HTML tags
+        self.editor.setPlainText(text)
         self.update_preview()
 
     def update_preview(self):
         text = self.editor.toPlainText()
-        # Default font size logic or just let Qt handle it
+        # [Optimization] Selecting models with the same (often empty) note skips the re-render
+        if text == self._rendered_text: return
+        self._rendered_text = text
         # Let Qt/QSS handle the font size
-        css = f"<style>img {{ max-width: 100%; height: auto; }} body {{ color: black; background-color: white; font-family: sans-serif; }}</style>"
-        try:
-            import markdown
-            html = markdown.markdown(text)
-            self.browser.setHtml(css + html)
-        except ImportError:
-            self.browser.setHtml(css + f"<pre>{text}</pre>")
+        render = _get_markdown_renderer()
+        if render:
+            self.browser.setHtml(_NOTE_CSS + render(text))
+        else:
+            self.browser.setHtml(_NOTE_CSS + f"<pre>{text}</pre>")
 
     def switch_to_edit(self):
         self.stack.setCurrentIndex(1)
@@ -1133,7 +1174,7 @@ class MarkdownNoteWidget(QWidget):
             
         cursor = self.editor.textCursor()
         if mtype == "image":
-            file_path, _ = QFileDialog.getOpenFile名称(self, "Select Image", "", "Images (*.png *.jpg *.jpeg *.webp *.gif)")
+            file_path, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Images (*.png *.jpg *.jpeg *.webp *.gif)")
             if file_path:
                 file_path = file_path.replace("\\", "/") 
                 name = os.path.basename(file_path)
@@ -1,6 +1,7 @@
 import json
 import os
 import base64
+from functools import lru_cache
 
 class ComfyNodeBuilder:
     """
@@ -15,15 +16,15 @@ class ComfyNodeBuilder:
     3. Encodes this JSON into a specific HTML format that ComfyUI's clipboard handler expects.
     """
 
-    # Mapping from internal folder types to ComfyUI Node Class 名称s
+    # Mapping from internal folder types to ComfyUI Node Class Names
     NODE_TYPE_MAPPING = {
         "checkpoints": "CheckpointLoaderSimple",
-        "loras": "LoraLoader模型Only",
+        "loras": "LoraLoaderModelOnly",
         "vae": "VAELoader",
         "controlnet": "ControlNetLoader",
         "clip": "CLIPLoader",
         "unet": "UNETLoader",
-        "upscale_models": "Upscale模型Loader",
+        "upscale_models": "UpscaleModelLoader",
         "diffusers": "DiffusersLoader",
         "diffusion_models": "UNETLoader",
     }
@@ -49,7 +50,7 @@ class ComfyNodeBuilder:
                 # [Fix] ComfyUI expects standard separators (often forward slashes work best even on Win)
                 # But let's keep it native or just ensure it's not absolute.
                 # Actually, ComfyUI on Windows is fine with backslashes, but we should ensure.
-            except Value错误:
+            except ValueError:
                 filename = os.path.basename(file_path)
         else:
             filename = os.path.basename(file_path)
@@ -95,6 +96,7 @@ class ComfyNodeBuilder:
         return payload
 
     @staticmethod
+    @lru_cache(maxsize=128) # [Optimization] Pure function of its args; repeat copies are free
     def create_html_clipboard(file_path, model_type, root_dir=None):
         """
         [Logic]
@@ -116,17 +118,46 @@ class ComfyNodeBuilder:
             # Embeddings are just text
             return payload, "text/plain"
             
-        json_str = json.dumps(payload)
-        b64_data = base64.b64encode(json_str.encode('utf-8')).decode('utf-8')
+        return ComfyNodeBuilder._wrap_html(payload), "text/html"
+
+    @staticmethod
+    def create_html_clipboard_batch(file_paths, model_type, root_dir=None):
+        """
+        [Logic]
+        Builds one clipboard payload for several files of the same folder, so a
+        multi-selection pastes as a column of nodes in a single Ctrl+V.
+        Embeddings (and types without a loader node) are returned as text lines.
         
-        # Exact format from clipboard dump
-        # Important: StartFragment/EndFragment comments are used by Chromium to identify the copy paste region
-        html = (
-            "<html><body>"
-            "<!--StartFragment-->"
-            f"""<meta charset="utf-8"><div><span data-metadata="{b64_data}"></span></div>"""
-            "<!--EndFragment-->"
-            "</body></html>"
-        )
+        Returns:
+            tuple: (html_or_text, mime_type)
+        """
+        nodes = []
+        texts = []
+        for file_path in file_paths:
+            payload = ComfyNodeBuilder.create_node_json(file_path, model_type, root_dir)
+            if isinstance(payload, str):
+                texts.append(payload)
+                continue
+            node = payload["nodes"][0]
+            index = len(nodes)
+            node["id"] = index + 1
+            node["order"] = index
+            node["pos"] = [0, index * 130] # Stack vertically instead of overlapping
+            nodes.append(node)
         
-        return html, "text/html"
+        if not nodes:
+            return "\n".join(texts), "text/plain"
+        return ComfyNodeBuilder._wrap_html({"nodes": nodes, "links": [], "groups": []}), "text/html"
+
+    # Exact format from clipboard dump
+    # Important: StartFragment/EndFragment comments are used by Chromium to identify the copy paste region
+    # [Optimization] Built once; a copy only base64-encodes the payload between the two halves
+    _HTML_HEAD = '<html><body><!--StartFragment--><meta charset="utf-8"><div><span data-metadata="'
+    _HTML_TAIL = '"></span></div><!--EndFragment--></body></html>'
+
+    @staticmethod
+    def _wrap_html(payload):
+        # Compact separators: ComfyUI doesn't care, and the base64 blob gets smaller
+        json_str = json.dumps(payload, separators=(",", ":"))
+        b64_data = base64.b64encode(json_str.encode('utf-8')).decode('ascii')
+        return ComfyNodeBuilder._HTML_HEAD + b64_data + ComfyNodeBuilder._HTML_TAIL
@@ -1,6 +1,10 @@
 import re
 import json
 
+# [Optimization] Compiled once; parsing runs for every image selected
+_NEGATIVE_PROMPT_RE = re.compile(r"Negative prompt:", re.IGNORECASE)
+_STEPS_RE = re.compile(r"\b步数:", re.IGNORECASE)
+
 def parse_generation_parameters(text):
     """
     Parses generation parameters from a string (A1111 format or similar).
@@ -18,7 +22,7 @@ def parse_generation_parameters(text):
     params_str = ""
     
     # Regex split for "Negative prompt:" (case-insensitive)
-    parts = re.split(r"Negative prompt:", text, flags=re.IGNORECASE)
+    parts = _NEGATIVE_PROMPT_RE.split(text)
     
     if len(parts) > 1:
         pos = parts[0].strip()
@@ -26,7 +30,7 @@ def parse_generation_parameters(text):
         remainder = parts[1]
     else:
         # Check if "步数:" exists directly without negative prompt
-        steps_match = re.search(r"\b步数:", text, flags=re.IGNORECASE)
+        steps_match = _STEPS_RE.search(text)
         if steps_match:
             pos = text[:steps_match.start()].strip()
             remainder = text[steps_match.start():]
@@ -35,7 +39,7 @@ def parse_generation_parameters(text):
             remainder = ""
     
     # Now split remainder for "步数:"
-    steps_parts = re.split(r"\b步数:", remainder, flags=re.IGNORECASE, maxsplit=1)
+    steps_parts = _STEPS_RE.split(remainder, maxsplit=1)
     if len(steps_parts) > 1:
         neg = steps_parts[0].strip()
         params_str = "步数:" + steps_parts[1]
@@ -1,4 +1,6 @@
 import os
+import re
+import hashlib
 import shutil
 import time
 import uuid
@@ -7,6 +9,8 @@ import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+_INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+
 class NetworkClient:
     """
     Centralized network client with session management, retries, and safe file downloading.
@@ -31,6 +35,7 @@ class NetworkClient:
         self.session.headers.update({
             'User-Agent': 'ComfyUI-Manager-QT',
         })
+        self.last_sha256 = None # Digest of the last file written by download_file
 
     def _get_headers(self, url):
         headers = {}
@@ -55,7 +60,7 @@ class NetworkClient:
             # Caller handles exceptions (logging/UI update)
             raise e
 
-    def download_file(self, url, dest_dir, filename=None, progress_callback=None, stop_callback=None):
+    def download_file(self, url, dest_dir, filename=None, progress_callback=None, stop_callback=None, compute_sha256=False):
         """
         Downloads a file safely using a temporary file and atomic rename.
         
@@ -65,12 +70,16 @@ class NetworkClient:
             filename (str, optional): Target filename. If None, derived from URL or Content-Disposition.
             progress_callback (callable, optional): function(downloaded_bytes, total_bytes)
             stop_callback (callable, optional): function returning True if download should stop
+            compute_sha256 (bool): Hash the stream while writing; result in self.last_sha256
             
         Returns:
             str: Absolute path to the downloaded file, or None on failure.
         """
         if not os.path.exists(dest_dir):
             os.makedirs(dest_dir, exist_ok=True)
+        self.last_sha256 = None
+        # [Optimization] Hash bytes as they arrive so auto-match never re-reads the file
+        hasher = hashlib.sha256() if compute_sha256 else None
             
         try:
             # 1. Resolve Stream
@@ -87,8 +96,7 @@ class NetworkClient:
                         params = msg['content-disposition'].params
                         if 'filename' in params:
                             filename = params['filename']
-                            import re
-                            filename = re.sub(r'[<>:"/\\|?*]', '', filename).strip()
+                            filename = _INVALID_FILENAME_CHARS_RE.sub('', filename).strip()
                     
                     if not filename:
                         path_part = url.split('?')[0]
@@ -105,10 +113,11 @@ class NetworkClient:
                     for chunk in r.iter_content(chunk_size=8192):
                         # [Safety] Check for external stop signal
                         if stop_callback and stop_callback():
-                             raise Interrupted错误("Download interrupted by user")
+                             raise InterruptedError("Download interrupted by user")
 
                         if chunk:
                             f.write(chunk)
+                            if hasher is not None: hasher.update(chunk)
                             downloaded += len(chunk)
                             if progress_callback and total_size > 0:
                                 progress_callback(downloaded, total_size)
@@ -117,7 +126,7 @@ class NetworkClient:
                 if os.path.exists(target_path):
                     try:
                         os.remove(target_path) # Overwrite intention?
-                    except OS错误:
+                    except OSError:
                         # [Fix] Create unique name if file is locked (e.g. video playing)
                         # OR just skip overwrite and use existing file?
                         # Skipping is better for cache efficiency.
@@ -126,6 +135,8 @@ class NetworkClient:
                         return target_path
 
                 shutil.move(temp_path, target_path)
+                if hasher is not None:
+                    self.last_sha256 = hasher.hexdigest().upper()
                 return target_path
 
         except Exception as e:
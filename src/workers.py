@@ -9,7 +9,7 @@ import concurrent.futures
 from collections import deque, OrderedDict
 
 # [Infra] PySide6 Imports
-from PySide6.QtCore import QThread, Signal, QMutex, QWaitCondition, Qt, QBuffer, QByteArray
+from PySide6.QtCore import QThread, QObject, QRunnable, Signal, QMutex, QWaitCondition, Qt, QBuffer, QByteArray
 from PySide6.QtGui import QImage, QImageReader
 
 # [Refactor] Services
@@ -27,14 +27,21 @@ from .core import (
     PREVIEW_EXTENSIONS,
     VIDEO_EXTENSIONS,
     MAX_FILE_LOAD_BYTES,
+    MAX_PROMPT_FILE_BYTES,
     CACHE_DIR_NAME,
-    BASE_DIR
+    BASE_DIR,
+    find_preview_path,
+    json_loads_bytes,
+    write_bytes_atomic
 )
 from .utils.network import NetworkClient
 
-# Optional dependencies
-if HAS_MARKDOWNIFY:
-    import markdownify
+# [Optimization] URL and markup patterns, compiled once
+_CIVITAI_MODEL_ID_RE = re.compile(r'models/(\d+)')
+_CIVITAI_VERSION_ID_RE = re.compile(r'modelVersionId=(\d+)')
+_HF_REPO_RE = re.compile(r'huggingface\.co/([^/]+)/([^/?#]+)')
+_MD_IMAGE_RE = re.compile(r'!\[(.*?)\]\((.*?)\)')
+_HTML_IMG_SRC_RE = re.compile(r'(<img[^>]+src=["\'])(.*?)(["\'][^>]*>)')
 
 #Fn: Utility
 def format_size(s):
@@ -55,6 +62,11 @@ class ImageLoader(QThread):
         self.mutex = QMutex()
         self.condition = QWaitCondition()
         self._is_running = True
+        # [Optimization] Per-requester counter, bumped by each new request from that requester
+        # and by clear_queue; a job from an older generation is dropped before its decode
+        # (or emit) instead of running to completion. Keyed per requester so the example
+        # tab's request does not cancel the preview's on the shared loader.
+        self._generations = {}
         
         # [Cache] LRU Cache
         self.cache = OrderedDict()
@@ -65,7 +77,7 @@ class ImageLoader(QThread):
             self.wait()
         except RuntimeError: pass
 
-    def load_image(self, path, target_width=None):
+    def load_image(self, path, target_width=None, requester=None):
         with QMutexWithLocker(self.mutex):
              # Check cache first
              if path in self.cache:
@@ -76,21 +88,30 @@ class ImageLoader(QThread):
              if os.path.isdir(path):
                  return # Skip directories
 
-             self.queue.clear() # Already locked
-             self.queue.append((path, target_width))
+             key = id(requester)
+             generation = self._generations.get(key, 0) + 1
+             self._generations[key] = generation
+             # Only this requester's pending job is superseded (already locked)
+             self.queue = deque(job for job in self.queue if job[2] != key)
+             self.queue.append((path, target_width, key, generation))
              self.condition.wakeOne()
             
     def clear_queue(self):
         with QMutexWithLocker(self.mutex):
+            for key in self._generations:
+                self._generations[key] += 1 # Also abandons the jobs in flight
             self.queue.clear()
 
+    def _is_stale(self, key, generation):
+        return generation != self._generations.get(key)
+
     def remove_from_cache(self, path):
         with QMutexWithLocker(self.mutex):
              if path in self.cache:
                  del self.cache[path]
 
     def stop(self):
-        logging.debug(f"[ImageLoader] Stop requested. is_running={self._is_running}")
+        logging.debug("[ImageLoader] Stop requested. is_running=%s", self._is_running)
         self._is_running = False
         with QMutexWithLocker(self.mutex):
             self.condition.wakeAll()
@@ -108,7 +129,7 @@ class ImageLoader(QThread):
             if not self.queue:
                 logging.debug("[ImageLoader] Queue empty. Waiting...")
                 self.condition.wait(self.mutex)
-                logging.debug(f"[ImageLoader] Woke up. is_running={self._is_running}")
+                logging.debug("[ImageLoader] Woke up. is_running=%s", self._is_running)
             
             if not self._is_running:
                 logging.debug("[ImageLoader] Post-wait exit check. Unlocking and breaking.")
@@ -117,21 +138,27 @@ class ImageLoader(QThread):
             
             path = None
             target_width = None
+            key = None
+            generation = 0
             if self.queue:
-                path, target_width = self.queue.popleft()
-                logging.debug(f"[ImageLoader] Popped: {path}")
+                path, target_width, key, generation = self.queue.popleft()
+                logging.debug("[ImageLoader] Popped: %s", path)
             
             self.mutex.unlock()
 
             if path:
                 try:
                     image = QImage()
-                    if os.path.exists(path):
+                    # [Optimization] A single stat answers both "does it exist" and "how big is it".
+                    try:
+                        f_size = os.stat(path).st_size
+                    except OSError:
+                        f_size = None
+                    if f_size is not None:
                         ext = os.path.splitext(path)[1].lower()
                         if ext in {'.mp4', '.webm', '.mkv', '.avi', '.mov', '.gif'}:
                             pass 
                         else:
-                            f_size = os.path.getsize(path)
                             if f_size > MAX_FILE_LOAD_BYTES:
                                  logging.warning(f"Skipping large file ({f_size} bytes): {path}")
                             else:
@@ -143,12 +170,19 @@ class ImageLoader(QThread):
                                     if orig_size.isValid() and (orig_size.width() > target_width or orig_size.height() > target_width):
                                          reader.setScaledSize(orig_size.scaled(target_width, target_width, Qt.KeepAspectRatio))
                                 
+                                if self._is_stale(key, generation):
+                                    logging.debug("[ImageLoader] Dropped stale job: %s", path)
+                                    reader.setDevice(None) # Release the file handle now
+                                    continue
                                 loaded = reader.read()
                                 if not loaded.isNull():
+                                    # [Optimization] Convert to the raster engine's native formats here,
+                                    # so QPixmap.fromImage on the GUI thread is a plain upload with no
+                                    # per-pixel conversion.
                                     if not loaded.hasAlphaChannel():
-                                         image = loaded.convertToFormat(QImage.Format_RGB888)
+                                         image = loaded.convertToFormat(QImage.Format_RGB32)
                                     else:
-                                         image = loaded
+                                         image = loaded.convertToFormat(QImage.Format_ARGB32_Premultiplied)
                                 
                                 reader.setDevice(None)
                                 del reader
@@ -156,8 +190,10 @@ class ImageLoader(QThread):
                 except Exception as e: 
                     logging.warning(f"图片加载失败 {path}: {e}")
 
-                self.image_loaded.emit(path, image)
+                if not self._is_stale(key, generation):
+                    self.image_loaded.emit(path, image)
                 
+                # A decoded stale image is still cached; the user often comes straight back to it
                 with QMutexWithLocker(self.mutex):
                     if not image.isNull():
                         self.cache[path] = image
@@ -165,6 +201,67 @@ class ImageLoader(QThread):
                         if len(self.cache) > self.CACHE_SIZE:
                             self.cache.popitem(last=False)
 
+# ==========================================
+# Detail Probe (QThreadPool)
+# ==========================================
+class DetailProbeSignals(QObject):
+    probed = Signal(int, str, object) # generation, path, (size, mtime, preview_path) or None
+
+class DetailProbeWorker(QRunnable):
+    """Stats a file and resolves its preview off the GUI thread."""
+    def __init__(self, path, generation):
+        super().__init__()
+        self.path = path
+        self.generation = generation
+        self.signals = DetailProbeSignals()
+
+    def run(self):
+        try:
+            st = os.stat(self.path)
+            result = (st.st_size, st.st_mtime, find_preview_path(self.path))
+        except OSError:
+            result = None
+        self.signals.probed.emit(self.generation, self.path, result)
+
+# ==========================================
+# Prompt File Loader (QThreadPool)
+# ==========================================
+class PromptFileSignals(QObject):
+    loaded = Signal(int, str, object, int) # generation, path, parsed data (None if too large), size
+    failed = Signal(int, str, str) # generation, path, error
+
+class PromptFileLoader(QRunnable):
+    """Reads and parses a prompt library JSON off the GUI thread.
+
+    `payload` is a not-yet-written copy of the file (see JsonWriter.latest_document);
+    when given it is parsed instead of the stale file on disk.
+    """
+    def __init__(self, path, generation, payload=None):
+        super().__init__()
+        self.path = path
+        self.generation = generation
+        self.payload = payload
+        self.signals = PromptFileSignals()
+
+    def run(self):
+        if self.payload is not None:
+            try:
+                data = json_loads_bytes(self.payload)
+            except Exception as e:
+                self.signals.failed.emit(self.generation, self.path, str(e))
+                return
+            self.signals.loaded.emit(self.generation, self.path, data, len(self.payload))
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                # Oversized libraries are reported, not parsed
+                data = json_loads_bytes(f.read()) if size <= MAX_PROMPT_FILE_BYTES else None
+        except Exception as e:
+            self.signals.failed.emit(self.generation, self.path, str(e))
+            return
+        self.signals.loaded.emit(self.generation, self.path, data, size)
+
 # ==========================================
 # Thumbnail Worker
 # ==========================================
@@ -190,28 +287,53 @@ class ThumbnailWorker(QThread):
 # ==========================================
 # Region: File System Workers
 # ==========================================
+# [Optimization] Shared pool for batched stat() calls on POSIX, where each
+# DirEntry.stat() is its own syscall (a network round trip on SMB/NFS)
+_STAT_BATCH = 32
+_stat_pool = None
+
+def _get_stat_pool():
+    global _stat_pool
+    if _stat_pool is None:
+        _stat_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="StatPool")
+    return _stat_pool
+
+def _safe_stat(entry):
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
 class FileScannerWorker(QThread):
     batch_ready = Signal(str, list, list) 
     finished = Signal(dict)
 
-    def __init__(self, base_path, extensions, recursive=True):
+    def __init__(self, base_path, extensions, recursive=True, with_stats=True):
         super().__init__()
         self.setObjectName("ScannerThread")
         self.base_path = base_path
         self.extensions = extensions
         self.recursive = recursive
+        self.with_stats = with_stats # False: only name/path are needed (indexing)
         self._is_running = True
         self.CHUNK_SIZE = 2000 # [Optimization] Increase batch size to reduce UI spam
 
     def stop(self):
         self._is_running = False
 
+    def _stat_entries(self, entries):
+        # DirEntry.stat() is served from the directory listing on Windows; elsewhere
+        # overlap the per-file syscalls in batches.
+        if os.name == "nt" or len(entries) < _STAT_BATCH:
+            return [_safe_stat(e) for e in entries]
+        return list(_get_stat_pool().map(_safe_stat, entries, chunksize=_STAT_BATCH))
+
     def run(self):
         if not os.path.exists(self.base_path):
             self.finished.emit({})
             return
 
-        logging.debug(f"[FileScanner] Starting scan for: {self.base_path}")
+        logging.debug("[FileScanner] Starting scan for: %s", self.base_path)
         stack = [self.base_path]
         visited = set()
         visited.add(os.path.realpath(self.base_path))
@@ -224,7 +346,7 @@ class FileScannerWorker(QThread):
             try:
                 with os.scandir(current_dir) as it:
                     dirs_buffer = []
-                    files_buffer = []
+                    file_entries = []
                     
                     for entry in it:
                         if not self._is_running: return
@@ -242,25 +364,29 @@ class FileScannerWorker(QThread):
                         
                         elif entry.is_file():
                              if os.path.splitext(entry.name)[1].lower() in self.extensions:
-                                 try:
-                                     st = entry.stat()
-                                     sz = format_size(st.st_size)
-                                     dt = time.strftime('%Y-%m-%d', time.localtime(st.st_mtime))
-                                     files_buffer.append({
-                                         "name": entry.name, 
-                                         "path": entry.path, 
-                                         "size": sz, 
-                                         "date": dt
-                                     })
-                                     
-                                     if len(files_buffer) >= self.CHUNK_SIZE:
-                                         self.batch_ready.emit(current_dir, [], files_buffer)
-                                         files_buffer = []
-
-                                 except OSError: pass
-                    
-                    if dirs_buffer or files_buffer:
-                         self.batch_ready.emit(current_dir, dirs_buffer, files_buffer)
+                                 file_entries.append(entry)
+
+                if self.with_stats:
+                    files_buffer = []
+                    for entry, st in zip(file_entries, self._stat_entries(file_entries)):
+                        if st is None: continue
+                        files_buffer.append({
+                            "name": entry.name, 
+                            "path": entry.path, 
+                            "size": format_size(st.st_size), 
+                            "date": time.strftime('%Y-%m-%d', time.localtime(st.st_mtime))
+                        })
+                else:
+                    files_buffer = [{"name": e.name, "path": e.path} for e in file_entries]
+
+                if not self._is_running: return
+                for i in range(0, len(files_buffer), self.CHUNK_SIZE):
+                    chunk = files_buffer[i:i + self.CHUNK_SIZE]
+                    # Folders go with the last chunk, as before
+                    is_last = i + self.CHUNK_SIZE >= len(files_buffer)
+                    self.batch_ready.emit(current_dir, dirs_buffer if is_last else [], chunk)
+                if dirs_buffer and not files_buffer:
+                    self.batch_ready.emit(current_dir, dirs_buffer, [])
             
             except OSError:
                 continue
@@ -330,7 +456,7 @@ class MetadataWorker(QThread):
     model_processed = Signal(bool, str, dict, str) 
     ask_overwrite = Signal(str)
 
-    def __init__(self, mode="auto", targets=None, manual_url=None, civitai_key="", hf_key="", cache_root=None, directories=None, overwrite_behavior='ask', cache_mode="model"):
+    def __init__(self, mode="auto", targets=None, manual_url=None, civitai_key="", hf_key="", cache_root=None, directories=None, overwrite_behavior='ask', cache_mode="model", api_service=None):
         super().__init__()
         self.mode = mode 
         self.cache_mode = cache_mode
@@ -345,7 +471,8 @@ class MetadataWorker(QThread):
         self._wait_condition = QWaitCondition()
         
         # [Refactor] Using Services
-        self.api_service = ApiService(civitai_key, hf_key)
+        # A shared service keeps its HTTP session (and keep-alive connections) across batches
+        self.api_service = api_service if api_service else ApiService(civitai_key, hf_key)
         self.file_service = FileService(cache_root if cache_root else CACHE_DIR_NAME)
 
     def stop(self):
@@ -419,24 +546,30 @@ class MetadataWorker(QThread):
 
                 if self.mode == "auto":
                     self.task_progress.emit(model_path, "正在检查哈希...", 10)
-                    file_hash, is_cached = self.file_service.get_cached_hash(
-                        model_path, self.directories, self.cache_mode, self.status_update
-                    )
+                    # [Optimization] BLAKE3 first when available; SHA256 is only tried after a real 404
+                    version_data = {}
+                    file_hash = None
+                    for file_hash, is_cached in self.file_service.iter_lookup_hashes(
+                        model_path, self.directories, self.cache_mode, self.status_update,
+                        stop_event=lambda: not self._is_running
+                    ):
+                        if not self._is_running: break
+                        if is_cached: self.task_progress.emit(model_path, "哈希值已缓存", 30)
+                        else: self.task_progress.emit(model_path, "正在计算哈希... 完成", 30)
+
+                        self.task_progress.emit(model_path, "正在搜索 Civitai...", 40)
+                        version_data, not_found = self.api_service.lookup_civitai_version(file_hash)
+                        # Network/server errors are not a miss: retrying with SHA256 would not help
+                        if version_data.get("modelId") or not not_found: break
                     
                     if not self._is_running: break
                     if not file_hash: raise Exception("哈希计算失败。")
-
-                    if is_cached: self.task_progress.emit(model_path, "哈希值已缓存", 30)
-                    else: self.task_progress.emit(model_path, "正在计算哈希... 完成", 30)
-
-                    self.task_progress.emit(model_path, "正在搜索 Civitai...", 40)
-                    version_data = self.api_service.fetch_civitai_version(file_hash)
                     model_id = version_data.get("modelId")
                     version_id = version_data.get("id")
                 else:
                     if not self.manual_url: raise Exception("未提供URL。")
-                    match_m = re.search(r'models/(\d+)', self.manual_url)
-                    match_v = re.search(r'modelVersionId=(\d+)', self.manual_url)
+                    match_m = _CIVITAI_MODEL_ID_RE.search(self.manual_url)
+                    match_v = _CIVITAI_VERSION_ID_RE.search(self.manual_url)
                     if match_m: model_id = match_m.group(1)
                     if match_v: version_id = match_v.group(1)
                 
@@ -467,6 +600,7 @@ class MetadataWorker(QThread):
                 ver_desc_html = target_version.get("description", "") or "" if target_version else ""
 
                 if HAS_MARKDOWNIFY:
+                    import markdownify # Lazy: pulls in BeautifulSoup
                     model_desc_md = markdownify.markdownify(model_desc_html, heading_style="ATX")
                     ver_desc_md = markdownify.markdownify(ver_desc_html, heading_style="ATX")
                 else:
@@ -513,7 +647,7 @@ class MetadataWorker(QThread):
 
     def _process_huggingface(self, model_path, url):
         self.task_progress.emit(model_path, "正在获取 Hugging Face 信息...", 20)
-        match = re.search(r'huggingface\.co/([^/]+)/([^/?#]+)', url)
+        match = _HF_REPO_RE.search(url)
         if not match: raise Exception("无效的 Hugging Face URL 格式。")
         repo_id = f"{match.group(1)}/{match.group(2)}"
         
@@ -561,8 +695,8 @@ class MetadataWorker(QThread):
             return match.group(0)
             
         try:
-             text = re.sub(r'!\[(.*?)\]\((.*?)\)', replace_md, text)
-             text = re.sub(r'(<img[^>]+src=["\'])(.*?)(["\'][^>]*>)', replace_html, text)
+             text = _MD_IMAGE_RE.sub(replace_md, text)
+             text = _HTML_IMG_SRC_RE.sub(replace_html, text)
         except Exception as e:
              logging.warning(f"错误 processing embedded images: {e}")
         return text
@@ -626,6 +760,7 @@ class 模型DownloadWorker(QThread):
         self._wait_mutex = QMutex()
         self._wait_condition = QWaitCondition()
         self.net_client = NetworkClient(civitai_key=api_key)
+        self.sha256 = None # Set after a completed download
 
     def stop(self):
         self._is_running = False
@@ -647,8 +782,8 @@ class 模型DownloadWorker(QThread):
             # 1. Resolve Info (名称, etc.)
             model_id = None
             version_id = None
-            match_m = re.search(r'models/(\d+)', self.url)
-            match_v = re.search(r'modelVersionId=(\d+)', self.url)
+            match_m = _CIVITAI_MODEL_ID_RE.search(self.url)
+            match_v = _CIVITAI_VERSION_ID_RE.search(self.url)
             if match_m: model_id = match_m.group(1)
             if match_v: version_id = match_v.group(1)
 
@@ -722,10 +857,12 @@ class 模型DownloadWorker(QThread):
             
             final_path = self.net_client.download_file(
                 download_url, self.target_dir, filename=fname, progress_callback=progress_cb,
-                stop_callback=lambda: not self._is_running
+                stop_callback=lambda: not self._is_running,
+                compute_sha256=True
             )
             
             if final_path:
+                self.sha256 = self.net_client.last_sha256
                 self.finished.emit("下载完成", final_path)
             else:
                 self.error.emit("下载失败（未返回文件路径）")
@@ -855,3 +992,76 @@ class LocalMetadataWorker(QThread):
                         
                 except Exception as e:
                     logging.error(f"Metadata extraction failed for {path}: {e}")
+
+# ==========================================
+# Region: JSON Writer
+# ==========================================
+class JsonWriter(QThread):
+    """Single background writer for JSON files.
+
+    Callers queue whole documents (already serialized); the newest one per file
+    wins, so a burst of edits is written once per flush and never blocks the UI
+    on disk I/O.
+    """
+    COALESCE_MS = 200
+    save_failed = Signal(str, str) # json_path, error
+
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("JsonWriterThread")
+        self.mutex = QMutex()
+        self.condition = QWaitCondition()
+        self._is_running = True
+        self.documents = {} # json_path -> serialized bytes replacing the whole file
+        self._in_flight = {} # documents taken by the current flush, until they hit the disk
+
+    def __del__(self):
+        try:
+            self.wait()
+        except RuntimeError: pass
+
+    def submit_document(self, json_path, payload):
+        with QMutexWithLocker(self.mutex):
+            self.documents[json_path] = payload
+            self.condition.wakeOne()
+
+    def latest_document(self, json_path):
+        """Newest queued or in-progress document for `json_path`, or None if it is on disk already."""
+        with QMutexWithLocker(self.mutex):
+            payload = self.documents.get(json_path)
+            return payload if payload is not None else self._in_flight.get(json_path)
+
+    def stop(self):
+        # Pending documents are still written before the thread exits
+        self._is_running = False
+        with QMutexWithLocker(self.mutex):
+            self.condition.wakeAll()
+
+    def run(self):
+        while True:
+            self.mutex.lock()
+            if not self.documents and self._is_running:
+                self.condition.wait(self.mutex)
+            self.mutex.unlock()
+
+            if self._is_running:
+                self.msleep(self.COALESCE_MS) # Let a burst of edits collapse into one write
+
+            with QMutexWithLocker(self.mutex):
+                documents, self.documents = self.documents, {}
+                self._in_flight = documents
+                running = self._is_running
+
+            for json_path, payload in documents.items():
+                self._write_document(json_path, payload)
+            with QMutexWithLocker(self.mutex):
+                self._in_flight = {}
+            if not running:
+                break
+
+    def _write_document(self, json_path, payload):
+        try:
+            write_bytes_atomic(json_path, payload)
+        except Exception as e:
+            logging.error(f"Save 错误: {e}")
+            self.save_failed.emit(json_path, str(e))